@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Category, Location, Post
+from .models import Category, Comment, Location, Post
 
 
 class CategoryAdmin(admin.ModelAdmin):
@@ -36,14 +36,42 @@ class PostAdmin(admin.ModelAdmin):
         'location',
         'category',
         'is_published',
+        'comment_count',
         'created_at',
     )
     list_editable = (
         'is_published',
     )
     search_fields = ('title', 'author', 'category')
+    actions = ('recount_comments',)
+
+    @admin.action(description='Пересчитать комментарии')
+    def recount_comments(self, request, queryset):
+        queryset.refresh_comment_count()
+
+
+class CommentAdmin(admin.ModelAdmin):
+    list_display = (
+        'text',
+        'author',
+        'post',
+        'is_published',
+        'created_at',
+    )
+    list_editable = (
+        'is_published',
+    )
+    list_select_related = ('author', 'post')
+    raw_id_fields = ('post',)
+
+    def get_readonly_fields(self, request, obj=None):
+        # Moving a comment would leave comment_count of the old post stale.
+        if obj is not None:
+            return ('post', *super().get_readonly_fields(request, obj))
+        return super().get_readonly_fields(request, obj)
 
 
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Location, LocationAdmin)
 admin.site.register(Post, PostAdmin)
+admin.site.register(Comment, CommentAdmin)
@@ -0,0 +1,186 @@
+from http import HTTPStatus
+
+from django.core.files.storage import default_storage
+from django.db.models import Case, F, When
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views import View
+
+from blog.models import Category, Comment, Post, User
+from blog.paginators import InvalidCursor, KeysetPaginator
+from blog.scheduler import publish_due_posts
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+FIELD_PREFIX = 'api_'
+
+POST_FIELDS = {
+    'id': F('id'),
+    'title': F('title'),
+    'text': F('text'),
+    'excerpt': F('excerpt'),
+    'reading_time': F('reading_time'),
+    'pub_date': F('pub_date'),
+    'updated_at': F('updated_at'),
+    'comment_count': F('comment_count'),
+    'image': F('image'),
+    'author': F('author__username'),
+    'category': F('category__slug'),
+    'location': Case(
+        When(location__is_published=True, then=F('location__name'))
+    ),
+}
+COMMENT_FIELDS = {
+    'id': F('id'),
+    'text': F('text'),
+    'created_at': F('created_at'),
+    'author': F('author__username'),
+}
+
+
+class ApiError(Exception):
+    pass
+
+
+def image_url(name):
+    return default_storage.url(name) if name else None
+
+
+class ApiView(View):
+    """Read-only JSON endpoint built on ``values()`` rows.
+
+    Only the columns of the requested ``fields`` are selected and rows
+    are serialized straight from dicts, without model instances.
+    Subclasses define ``get_data``; list views define ``get_queryset``.
+    """
+
+    fields = POST_FIELDS
+    default_fields = tuple(POST_FIELDS)
+    converters = {'image': image_url}
+
+    def get(self, request, *args, **kwargs):
+        publish_due_posts()
+        try:
+            return JsonResponse(self.get_data())
+        except ApiError as error:
+            return self.error(str(error), HTTPStatus.BAD_REQUEST)
+        except Http404:
+            return self.error('Не найдено.', HTTPStatus.NOT_FOUND)
+
+    @staticmethod
+    def error(detail, status):
+        return JsonResponse({'detail': detail}, status=status)
+
+    def get_fields(self):
+        requested = self.request.GET.get('fields')
+        if not requested:
+            return self.default_fields
+        names = tuple(dict.fromkeys(
+            name.strip() for name in requested.split(',') if name.strip()
+        ))
+        unknown = [name for name in names if name not in self.fields]
+        if unknown or not names:
+            raise ApiError(
+                'Неизвестные поля: {}. Доступны: {}.'.format(
+                    ', '.join(unknown), ', '.join(self.fields)
+                )
+            )
+        return names
+
+    def select(self, queryset, names, *extra):
+        return queryset.values(*extra, **{
+            FIELD_PREFIX + name: self.fields[name] for name in names
+        })
+
+    def serialize(self, row, names):
+        item = {}
+        for name in names:
+            value = row[FIELD_PREFIX + name]
+            converter = self.converters.get(name)
+            item[name] = value if converter is None else converter(value)
+        return item
+
+
+class ApiListView(ApiView):
+    cursor_kwarg = 'cursor'
+    ordering = ('-pub_date', '-id')
+    default_fields = tuple(name for name in POST_FIELDS if name != 'text')
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.GET.get('limit', DEFAULT_LIMIT))
+        except ValueError:
+            raise ApiError('Параметр limit должен быть числом.')
+        return max(1, min(limit, MAX_LIMIT))
+
+    def get_page_url(self, cursor):
+        if cursor is None:
+            return None
+        params = self.request.GET.copy()
+        params[self.cursor_kwarg] = cursor
+        return self.request.build_absolute_uri(
+            f'{self.request.path}?{params.urlencode()}'
+        )
+
+    def get_data(self):
+        names = self.get_fields()
+        queryset = self.select(
+            self.get_queryset(), names,
+            *(field.lstrip('-') for field in self.ordering)
+        )
+        paginator = KeysetPaginator(queryset, self.get_limit(), self.ordering)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor as error:
+            raise ApiError(str(error))
+        return {
+            'results': [self.serialize(row, names) for row in page],
+            'next': self.get_page_url(page.next_cursor),
+            'previous': self.get_page_url(page.previous_cursor),
+        }
+
+
+class FeedApiView(ApiListView):
+
+    def get_queryset(self):
+        return Post.objects.published_feed()
+
+
+class CategoryFeedApiView(ApiListView):
+
+    def get_queryset(self):
+        category = get_object_or_404(
+            Category, slug=self.kwargs['slug'], is_published=True
+        )
+        return Post.objects.for_category(category)
+
+
+class AuthorFeedApiView(ApiListView):
+
+    def get_queryset(self):
+        author = get_object_or_404(User, username=self.kwargs['username'])
+        return Post.objects.for_author(author)
+
+
+class PostApiView(ApiView):
+
+    def get_data(self):
+        names = self.get_fields()
+        post = self.select(
+            Post.objects.published().filter(pk=self.kwargs['pk']), names
+        ).first()
+        if post is None:
+            raise Http404
+        return self.serialize(post, names)
+
+
+class CommentsApiView(ApiListView):
+    fields = COMMENT_FIELDS
+    default_fields = tuple(COMMENT_FIELDS)
+    ordering = ('created_at', 'id')
+
+    def get_queryset(self):
+        post = get_object_or_404(
+            Post.objects.published(), pk=self.kwargs['pk']
+        )
+        return Comment.objects.filter(post=post)
@@ -0,0 +1,246 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+
+VERSION_KEY = 'blog:version:{}'
+PAGE_KEY = 'blog:page:{}'
+POST_CARD_KEY = 'blog:post_card:{}'
+FRAGMENT_KEY = 'blog:fragment:{}'
+POST_CARD_TEMPLATE = 'includes/post_card.html'
+STORED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control', 'Link')
+HEADER_HOLE = '<!--blog:header-->'
+HEADER_TEMPLATE = 'includes/header.html'
+# Every cached page depends on this tag. Bulk loads bump it once instead
+# of bumping a tag per loaded object.
+BULK_TAG = 'bulk'
+
+
+def get_versions(*names):
+    return read_versions(names)[0]
+
+
+def read_versions(names):
+    """Return the versions of tags and the names created by this call.
+
+    A tag without a version gets the current time, so a version newer
+    than a render does not mean a bump if the render created it.
+    """
+    keys = {VERSION_KEY.format(name): name for name in names}
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    for key, version in missing.items():
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+        versions[key] = version
+    created = {keys[key] for key in missing}
+    return {keys[key]: version for key, version in versions.items()}, created
+
+
+def get_version(name):
+    return get_versions(name)[name]
+
+
+def bump_versions(*names):
+    version = time.time_ns()
+    cache.set_many(
+        {VERSION_KEY.format(name): version for name in names}, None
+    )
+
+
+def post_card_stamp(post):
+    category, location = post.category, post.location
+    parts = (
+        post.title, post.excerpt, post.reading_time, post.pub_date,
+        post.is_published, post.image.name, post.comment_count,
+        post.author.username,
+        category and (category.slug, category.title, category.is_published),
+        location and (location.name, location.is_published),
+    )
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def render_post_cards(posts):
+    """Render post cards, reusing fragments whose stamp is still current.
+
+    Each fragment is stored as ``(stamp, html)`` under the post id, so a
+    whole page is fetched with one ``get_many`` and a fragment is reused
+    only while the values it was rendered from are unchanged.
+    """
+    posts = {POST_CARD_KEY.format(post.pk): post for post in posts}
+    cached = cache.get_many(posts)
+    cards, rendered = [], {}
+    for key, post in posts.items():
+        stamp = post_card_stamp(post)
+        card_stamp, card = cached.get(key, (None, None))
+        if card_stamp != stamp:
+            card = render_to_string(POST_CARD_TEMPLATE, {'post': post})
+            rendered[key] = (stamp, card)
+        cards.append(card)
+    if rendered:
+        cache.set_many(rendered, settings.BLOG_POST_CARD_TIMEOUT)
+    return cards
+
+
+def invalidate_post_cards(post_ids):
+    cache.delete_many([POST_CARD_KEY.format(pk) for pk in post_ids])
+
+
+def post_cache_tags(posts):
+    tags = set()
+    for post in posts:
+        tags.add(f'post:{post.pk}')
+        tags.add(f'author:{post.author_id}')
+        if post.category_id:
+            tags.add(f'category:{post.category_id}')
+        if post.location_id:
+            tags.add(f'location:{post.location_id}')
+    return tags
+
+
+def comment_cache_tags(comments):
+    return {f'author:{comment.author_id}' for comment in comments}
+
+
+def render_fragment(name, tags, template, get_context, get_tags=None):
+    """Render a user-independent fragment once per version of its tags.
+
+    ``get_context`` is only called on a miss, so queries that feed the
+    fragment are skipped while the cached copy is current. ``get_tags``
+    adds tags known only from the context; they are stored with the
+    fragment. Return the fragment, all of its tags and the tags whose
+    versions were created meanwhile.
+    """
+    key = FRAGMENT_KEY.format(name)
+    cached = cache.get(key)
+    created = set()
+    if cached is not None and cached[0].keys() >= set(tags):
+        versions, created = read_versions(cached[0])
+        if versions == cached[0]:
+            return cached[1], set(versions), created
+    started = time.time_ns()
+    versions, created_now = read_versions(tags)
+    context = get_context()
+    extra = set(get_tags(context)) - versions.keys() if get_tags else set()
+    extra_versions, created_extra = read_versions(extra)
+    created |= created_now | created_extra
+    fragment = render_to_string(template, context)
+    if not any(
+        version > started
+        for tag, version in extra_versions.items() if tag not in created
+    ):
+        cache.set(
+            key, ({**versions, **extra_versions}, fragment),
+            settings.BLOG_POST_CARD_TIMEOUT
+        )
+    return fragment, {*versions, *extra_versions}, created
+
+
+def post_updated_at(post):
+    return max(
+        item.updated_at
+        for item in (post, post.category, post.location) if item is not None
+    )
+
+
+def page_validators(posts, versions, *parts):
+    """Return an ETag and a Last-Modified timestamp for a page.
+
+    Both are derived from the ``updated_at`` of the shown posts and from
+    the versions of the page tags, which also move on deletions and
+    scheduled publications.
+    """
+    stamps = [(post.pk, post_updated_at(post)) for post in posts]
+    etag = hashlib.md5(
+        repr((parts, sorted(versions.items()), stamps)).encode()
+    ).hexdigest()
+    last_modified = max(
+        [int(stamp.timestamp()) for _, stamp in stamps]
+        + [version // 10 ** 9 for version in versions.values()],
+        default=None
+    )
+    return f'"{etag}"', last_modified
+
+
+def is_page_cacheable(request, shared=False):
+    return (
+        bool(settings.BLOG_PAGE_CACHE_TIMEOUT)
+        and request.method in ('GET', 'HEAD')
+        and (shared or not request.user.is_authenticated)
+    )
+
+
+def personal_etag(etag, request):
+    user = request.user
+    digest = hashlib.md5(
+        f'{etag}:{user.pk}:{user.get_username()}'.encode()
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def fill_holes(request, response):
+    """Splice the header of the current user into a shared page shell."""
+    hole = HEADER_HOLE.encode()
+    if hole in response.content:
+        header = render_to_string(HEADER_TEMPLATE, request=request)
+        response.content = response.content.replace(
+            hole, header.encode(), 1
+        )
+    return response
+
+
+def page_cache_key(request):
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return PAGE_KEY.format(path)
+
+
+def get_cached_page(request):
+    entry = cache.get(page_cache_key(request))
+    if entry is None:
+        return None
+    if get_versions(*entry['tags']) != entry['tags']:
+        return None
+    response = HttpResponse(
+        entry['content'], content_type=entry['content_type']
+    )
+    for header, value in entry.get('headers', {}).items():
+        response[header] = value
+    response.is_shell = entry.get('shell', False)
+    return response
+
+
+def store_page(request, response, tags, started, timeout, etag=None,
+               shell=False, created=()):
+    """Cache a rendered page under the current versions of its tags.
+
+    Pages whose tags were bumped after ``started`` are skipped: the data
+    they were rendered from may already be outdated. Tags ``created``
+    earlier in the request are not bumps. A ``shell`` is a page shared
+    by all users, stored with the user-independent ``etag`` and its
+    header hole still open.
+    """
+    if response.status_code != 200 or response.cookies:
+        return
+    versions, created_now = read_versions(tags)
+    created = {*created, *created_now}
+    if any(
+        version > started
+        for tag, version in versions.items() if tag not in created
+    ):
+        return
+    headers = {
+        header: response[header]
+        for header in STORED_HEADERS if response.has_header(header)
+    }
+    if etag is not None:
+        headers['ETag'] = etag
+    cache.set(page_cache_key(request), {
+        'tags': versions,
+        'content': response.content,
+        'content_type': response['Content-Type'],
+        'headers': headers,
+        'shell': shell,
+    }, timeout)
@@ -0,0 +1,20 @@
+from django.core.checks import Error, register
+from django.db import connections
+
+from blog.search import SEARCH_TABLE
+
+
+@register()
+def check_search_backend(app_configs, **kwargs):
+    """Post search and the signals that index posts need SQLite FTS5."""
+    if connections['default'].vendor == 'sqlite':
+        return []
+    return [Error(
+        'Полнотекстовый поиск публикаций поддерживается только в SQLite.',
+        hint=(
+            f'Таблица {SEARCH_TABLE} создаётся миграцией как виртуальная '
+            'таблица FTS5, а сигналы публикаций пишут в неё при каждом '
+            'сохранении.'
+        ),
+        id='blog.E001',
+    )]
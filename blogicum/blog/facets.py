@@ -0,0 +1,165 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Q
+
+from blog.models import Post, PostFacet
+
+# Post fields holding the value of each facet.
+FACET_FIELDS = {
+    PostFacet.CATEGORY: 'category_id',
+    PostFacet.LOCATION: 'location_id',
+}
+
+
+def bitmap(ids):
+    """Pack post ids into an int whose set bits are those ids."""
+    ids = list(ids)
+    if not ids:
+        return 0
+    bits = bytearray(max(ids) // 8 + 1)
+    for pk in ids:
+        bits[pk >> 3] |= 1 << (pk & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def to_bytes(value):
+    return value.to_bytes((value.bit_length() + 7) // 8, 'little')
+
+
+def popcount(value):
+    return bin(value).count('1')
+
+
+def post_facets(post):
+    """Return the ``(facet, value)`` pairs a post is filed under."""
+    pairs = set()
+    for facet, field in FACET_FIELDS.items():
+        value = getattr(post, field)
+        if value is not None:
+            pairs.add((facet, value))
+    return pairs
+
+
+def stored_facets(pk):
+    """Return the ``(facet, value)`` pairs of a post as saved in the db."""
+    if pk is None:
+        return set()
+    post = Post.objects.filter(pk=pk).only(*FACET_FIELDS.values()).first()
+    return post_facets(post) if post else set()
+
+
+def update_facets(added=(), removed=()):
+    """Set and clear post bits in the facet bitmaps.
+
+    ``added`` and ``removed`` are ``(post id, facet, value)`` triples.
+    Only the bitmaps they name are read and rewritten, under a row lock,
+    so an update costs the same however many posts there are.
+    """
+    changes = defaultdict(lambda: ([], []))
+    for pk, facet, value in added:
+        changes[facet, value][0].append(pk)
+    for pk, facet, value in removed:
+        changes[facet, value][1].append(pk)
+    if not changes:
+        return
+    lookup = Q()
+    for facet, value in changes:
+        lookup |= Q(facet=facet, value=value)
+    with transaction.atomic():
+        stored = {
+            (row.facet, row.value): row
+            for row in PostFacet.objects.select_for_update().filter(lookup)
+        }
+        created = []
+        for (facet, value), (set_ids, clear_ids) in changes.items():
+            row = stored.get((facet, value))
+            if row is None:
+                if not set_ids:
+                    continue
+                row = PostFacet(facet=facet, value=value)
+                created.append(row)
+            bits = int.from_bytes(row.bitmap, 'little') | bitmap(set_ids)
+            row.bitmap = to_bytes(bits & ~bitmap(clear_ids))
+        PostFacet.objects.bulk_update(stored.values(), ('bitmap',))
+        PostFacet.objects.bulk_create(created)
+
+
+def move_post(pk, before, after):
+    """File a post under its new facet values instead of the old ones."""
+    update_facets(
+        added=[(pk, *pair) for pair in after - before],
+        removed=[(pk, *pair) for pair in before - after],
+    )
+
+
+def index_facets(post_ids):
+    """Set the bits of posts inserted without ``post_save``."""
+    rows = Post.objects.filter(pk__in=list(post_ids)).values_list(
+        'id', *FACET_FIELDS.values()
+    )
+    update_facets(added=[
+        (pk, facet, value)
+        for pk, *values in rows
+        for facet, value in zip(FACET_FIELDS, values)
+        if value is not None
+    ])
+
+
+def drop_facet(facet, value):
+    PostFacet.objects.filter(facet=facet, value=value).delete()
+
+
+def rebuild_facets(batch_size=500):
+    ids = defaultdict(list)
+    total = 0
+    rows = Post.objects.order_by().values_list(
+        'id', *FACET_FIELDS.values()
+    ).iterator(chunk_size=batch_size)
+    for pk, *values in rows:
+        total += 1
+        for facet, value in zip(FACET_FIELDS, values):
+            if value is not None:
+                ids[facet, value].append(pk)
+    PostFacet.objects.all().delete()
+    PostFacet.objects.bulk_create(
+        [
+            PostFacet(facet=facet, value=value, bitmap=to_bytes(bitmap(pks)))
+            for (facet, value), pks in ids.items()
+        ],
+        batch_size=batch_size
+    )
+    return total
+
+
+class FacetIndex:
+    """Bitmaps of posts per category and per location.
+
+    Counting the hits of a query in every facet value is then one AND
+    and one popcount per value, independent of how many posts there are
+    in each category or location.
+    """
+
+    def __init__(self, bitmaps):
+        self.bitmaps = bitmaps
+
+    @classmethod
+    def load(cls):
+        return cls({
+            (facet, value): int.from_bytes(bits, 'little')
+            for facet, value, bits in PostFacet.objects.values_list(
+                'facet', 'value', 'bitmap'
+            )
+        })
+
+    def get(self, facet, value):
+        return self.bitmaps.get((facet, value), 0)
+
+    def count(self, facet, hits):
+        counts = {}
+        for (name, value), bits in self.bitmaps.items():
+            if name == facet:
+                matched = popcount(hits & bits)
+                if matched:
+                    counts[value] = matched
+        return counts
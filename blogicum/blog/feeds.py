@@ -0,0 +1,167 @@
+from datetime import datetime, timezone
+from io import StringIO
+
+from django.conf import settings
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.http import http_date
+from django.utils.xmlutils import SimplerXMLGenerator
+from django.views import View
+
+from blog.caching import get_versions, page_validators
+from blog.models import Category, Post, User
+from blog.scheduler import publish_due_posts
+
+FEED_CHUNK_SIZE = 100
+ITEMS_PLACEHOLDER = '<!--items-->'
+
+
+class StreamingFeedMixin:
+    """Feed generator that writes entries one by one as they are read."""
+
+    def __init__(self, *args, updated=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.updated = updated
+
+    def latest_post_date(self):
+        return self.updated or super().latest_post_date()
+
+    def write_items(self, handler):
+        handler.ignorableWhitespace(ITEMS_PLACEHOLDER)
+
+    def stream(self, entries, encoding='utf-8'):
+        document = StringIO()
+        self.write(document, encoding)
+        head, tail = document.getvalue().split(ITEMS_PLACEHOLDER)
+        yield head
+        for entry in entries:
+            self.add_item(**entry)
+            item = StringIO()
+            super().write_items(SimplerXMLGenerator(item, encoding))
+            self.items.clear()
+            yield item.getvalue()
+        yield tail
+
+
+class StreamingAtomFeed(StreamingFeedMixin, Atom1Feed):
+    pass
+
+
+class StreamingRssFeed(StreamingFeedMixin, Rss201rev2Feed):
+    pass
+
+
+FEED_TYPES = {
+    'atom': StreamingAtomFeed,
+    'rss': StreamingRssFeed,
+}
+
+
+class PostFeedView(View):
+    title = 'Блогикум'
+    description = 'Новые публикации'
+    page_url_name = 'blog:index'
+
+    def get_queryset(self):
+        return Post.objects.published_feed()
+
+    def get_cache_tags(self):
+        return {'feed'}
+
+    def get_title(self):
+        return self.title
+
+    def get_page_url(self):
+        return reverse(self.page_url_name)
+
+    def get_entries(self):
+        posts = self.get_queryset()[:settings.BLOG_FEED_LENGTH]
+        for post in posts.iterator(chunk_size=FEED_CHUNK_SIZE):
+            link = self.request.build_absolute_uri(
+                reverse('blog:post_detail', kwargs={'pk': post.pk})
+            )
+            yield {
+                'title': post.title,
+                'link': link,
+                'unique_id': link,
+                'description': post.excerpt,
+                'author_name': post.author.get_username(),
+                'pubdate': post.pub_date,
+                'updateddate': post.updated_at,
+                'categories': [post.category.title] if post.category else [],
+            }
+
+    def get(self, request, feed_format, **kwargs):
+        if feed_format not in FEED_TYPES:
+            raise Http404
+        publish_due_posts()
+        etag, last_modified = page_validators(
+            [], get_versions(*self.get_cache_tags()),
+            request.get_full_path()
+        )
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            feed = FEED_TYPES[feed_format](
+                title=self.get_title(),
+                link=request.build_absolute_uri(self.get_page_url()),
+                description=self.description,
+                feed_url=request.build_absolute_uri(),
+                language=settings.LANGUAGE_CODE,
+                updated=datetime.fromtimestamp(last_modified, timezone.utc),
+            )
+            response = StreamingHttpResponse(
+                feed.stream(self.get_entries()),
+                content_type=feed.content_type
+            )
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class CategoryFeedView(PostFeedView):
+
+    def dispatch(self, request, *args, **kwargs):
+        self.category = get_object_or_404(
+            Category, slug=kwargs['slug'], is_published=True
+        )
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_queryset(self):
+        return Post.objects.for_category(self.category)
+
+    def get_cache_tags(self):
+        return {'feed', f'category:{self.category.pk}'}
+
+    def get_title(self):
+        return f'{self.title}: {self.category.title}'
+
+    def get_page_url(self):
+        return reverse(
+            'blog:category_posts', kwargs={'slug': self.category.slug}
+        )
+
+
+class ProfileFeedView(PostFeedView):
+
+    def dispatch(self, request, *args, **kwargs):
+        self.author = get_object_or_404(User, username=kwargs['username'])
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_queryset(self):
+        return Post.objects.for_author(self.author)
+
+    def get_cache_tags(self):
+        return {'feed', f'author:{self.author.pk}'}
+
+    def get_title(self):
+        return f'{self.title}: {self.author.get_username()}'
+
+    def get_page_url(self):
+        return reverse(
+            'blog:profile', kwargs={'username': self.author.get_username()}
+        )
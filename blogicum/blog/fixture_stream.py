@@ -0,0 +1,206 @@
+import json
+import re
+from collections import defaultdict
+
+from django.apps import apps
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, connections, router, transaction
+from django.db.models.signals import pre_save
+
+CHUNK_SIZE = 64 * 1024
+SEPARATORS = re.compile(r'[ \t\n\r,]*')
+
+
+def _read_array_start(stream, chunk_size):
+    buffer = ''
+    while True:
+        chunk = stream.read(chunk_size)
+        buffer = (buffer + chunk).lstrip()
+        if buffer:
+            if buffer[0] != '[':
+                raise ValueError('Ожидался JSON-массив объектов.')
+            return buffer[1:]
+        if not chunk:
+            raise ValueError('Пустой JSON-документ.')
+
+
+def iter_json_array(stream, chunk_size=CHUNK_SIZE):
+    """Yield the items of a top-level JSON array read from a text stream.
+
+    Only the current chunk and the item being decoded are kept in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer = _read_array_start(stream, chunk_size)
+    position = 0
+    while True:
+        position = SEPARATORS.match(buffer, position).end()
+        if buffer.startswith(']', position):
+            return
+        try:
+            item, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                raise ValueError('Неожиданный конец JSON-документа.')
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        yield item
+
+
+def insert_raw(model, objects, using=DEFAULT_DB_ALIAS):
+    """Insert objects in batches without calling fields' ``pre_save``.
+
+    Values of ``auto_now`` fields are written as set on the objects, the
+    way ``save(raw=True)`` does. Objects without a primary key get one
+    from the database.
+    """
+    if not objects:
+        return
+    fields = [
+        field for field in model._meta.local_concrete_fields
+        if not (field.primary_key and objects[0].pk is None)
+    ]
+    manager = model._base_manager.using(using)
+    size = max(connections[using].ops.bulk_batch_size(fields, objects), 1)
+    for start in range(0, len(objects), size):
+        manager._insert(objects[start:start + size], fields=fields, raw=True)
+
+
+class StreamLoader:
+    """Load dumpdata-style objects with batched inserts.
+
+    Rows are inserted raw, like ``loaddata`` does, so stored timestamps
+    are kept. Constraint checks are deferred to the end, which lets
+    objects reference rows that come later in the stream. The whole
+    stream is one transaction, so a dangling reference found by that
+    check rolls back every batch.
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS, batch_size=1000):
+        self.using = using
+        self.batch_size = batch_size
+        self.pending = defaultdict(list)
+        self.loaded = defaultdict(list)
+
+    def load(self, items):
+        connection = connections[self.using]
+        with transaction.atomic(using=self.using), \
+                connection.constraint_checks_disabled():
+            for deserialized in serializers.deserialize(
+                'python', items, using=self.using, ignorenonexistent=True
+            ):
+                model = type(deserialized.object)
+                if not router.allow_migrate_model(self.using, model):
+                    continue
+                batch = self.pending[model]
+                batch.append(deserialized)
+                if len(batch) >= self.batch_size:
+                    self.flush(model)
+            for model in list(self.pending):
+                self.flush(model)
+            connection.check_constraints(table_names=[
+                model._meta.db_table for model in self.loaded
+            ])
+        return {model: len(pks) for model, pks in self.loaded.items()}
+
+    def flush(self, model):
+        batch = self.pending.pop(model, [])
+        if not batch:
+            return
+        objects = [deserialized.object for deserialized in batch]
+        for obj in objects:
+            pre_save.send(
+                sender=model, instance=obj, raw=True, using=self.using,
+                update_fields=None
+            )
+        self._write(model, objects)
+        self._write_m2m(model, batch)
+        self.loaded[model].extend(obj.pk for obj in objects)
+
+    def _write(self, model, objects):
+        manager = model._base_manager.using(self.using)
+        existing = set(manager.filter(
+            pk__in=[obj.pk for obj in objects]
+        ).values_list('pk', flat=True))
+        fields = model._meta.local_concrete_fields
+        updated = [obj for obj in objects if obj.pk in existing]
+        if updated:
+            manager.bulk_update(
+                updated,
+                [field.name for field in fields if not field.primary_key]
+            )
+        insert_raw(
+            model, [obj for obj in objects if obj.pk not in existing],
+            self.using
+        )
+
+    def _write_m2m(self, model, batch):
+        for field in model._meta.many_to_many:
+            through = field.remote_field.through
+            if not through._meta.auto_created:
+                continue
+            source = field.m2m_field_name()
+            target = field.m2m_reverse_field_name()
+            rows, owners = [], []
+            for deserialized in batch:
+                if field.name not in deserialized.m2m_data:
+                    continue
+                owners.append(deserialized.object.pk)
+                rows.extend(
+                    through(**{f'{source}_id': deserialized.object.pk,
+                               f'{target}_id': pk})
+                    for pk in deserialized.m2m_data[field.name]
+                )
+            if not owners:
+                continue
+            manager = through._base_manager.using(self.using)
+            manager.filter(**{f'{source}__in': owners}).delete()
+            manager.bulk_create(rows, batch_size=self.batch_size)
+
+
+def get_dump_models(labels=(), exclude=()):
+    if labels:
+        models = []
+        for label in labels:
+            if '.' in label:
+                models.append(apps.get_model(label))
+            else:
+                models.extend(apps.get_app_config(label).get_models())
+    else:
+        models = [
+            model for model in apps.get_models()
+            if not model._meta.proxy and model._meta.managed
+        ]
+    excluded = set()
+    for label in exclude:
+        if '.' in label:
+            excluded.add(apps.get_model(label))
+        else:
+            excluded.update(apps.get_app_config(label).get_models())
+    app_list = defaultdict(list)
+    for model in models:
+        if model not in excluded:
+            app_list[model._meta.app_config].append(model)
+    return serializers.sort_dependencies(app_list.items())
+
+
+def dump_objects(stream, models, indent=None, batch_size=1000,
+                 using=DEFAULT_DB_ALIAS):
+    """Write objects of the models as a dumpdata-style JSON array."""
+    separator = '\n' if indent is not None else ' '
+    stream.write('[')
+    first = True
+    for model in models:
+        queryset = model._default_manager.using(using).order_by(
+            model._meta.pk.name
+        )
+        for obj in queryset.iterator(chunk_size=batch_size):
+            data = serializers.serialize('python', [obj])[0]
+            stream.write(separator if first else ',' + separator)
+            stream.write(json.dumps(
+                data, cls=DjangoJSONEncoder, ensure_ascii=False,
+                indent=indent
+            ))
+            first = False
+    stream.write('\n]\n' if indent is not None else ']\n')
@@ -1,14 +1,94 @@
 from django import forms
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from PIL import Image, ImageOps
+
 from .models import Post, Comment
 from django.contrib.auth import get_user_model
 
 
+class BoundedImageField(forms.ImageField):
+    """Image field that checks size and dimensions before decoding.
+
+    Only the image header is read until the limits are known to hold,
+    and metadata is stripped by re-encoding into a file on disk.
+    """
+
+    default_error_messages = {
+        'file_too_large': (
+            'Размер файла не должен превышать %(limit)s МБ.'
+        ),
+        'too_many_pixels': (
+            'Изображение не должно быть больше %(limit)s мегапикселей.'
+        ),
+    }
+
+    def to_python(self, data):
+        upload = forms.FileField.to_python(self, data)
+        if upload is None:
+            return None
+        if upload.size > settings.BLOG_IMAGE_MAX_BYTES:
+            raise ValidationError(
+                self.error_messages['file_too_large'],
+                code='file_too_large',
+                params={'limit': settings.BLOG_IMAGE_MAX_BYTES // 2 ** 20},
+            )
+        try:
+            with Image.open(upload) as image:
+                self.check_pixels(image)
+                image.verify()
+            upload.seek(0)
+            with Image.open(upload) as image:
+                upload.content_type = Image.MIME.get(image.format)
+                if image.getexif():
+                    upload = self.strip_metadata(upload, image)
+        except ValidationError:
+            raise
+        except Image.DecompressionBombError as error:
+            raise self.pixels_error() from error
+        except Exception as error:
+            raise ValidationError(
+                self.error_messages['invalid_image'], code='invalid_image'
+            ) from error
+        upload.seek(0)
+        return upload
+
+    def check_pixels(self, image):
+        width, height = image.size
+        if width * height > settings.BLOG_IMAGE_MAX_PIXELS:
+            raise self.pixels_error()
+
+    def pixels_error(self):
+        return ValidationError(
+            self.error_messages['too_many_pixels'],
+            code='too_many_pixels',
+            params={'limit': settings.BLOG_IMAGE_MAX_PIXELS // 10 ** 6},
+        )
+
+    @staticmethod
+    def strip_metadata(upload, image):
+        options = {'icc_profile': image.info.get('icc_profile')}
+        if image.format == 'JPEG':
+            options['quality'] = 90
+        image_format = image.format
+        image = ImageOps.exif_transpose(image)
+        image.info.pop('exif', None)
+        stripped = TemporaryUploadedFile(
+            upload.name, upload.content_type, 0, None
+        )
+        image.save(stripped, image_format, **options)
+        stripped.size = stripped.tell()
+        return stripped
+
+
 class PostForm(forms.ModelForm):
 
     class Meta:
         model = Post
         fields = '__all__'
         exclude = ('author', 'slug')
+        field_classes = {'image': BoundedImageField}
         widgets = {
             'pub_date': forms.DateTimeInput(
                 format=("%Y-%m-%d %H:%M:%S"),
@@ -0,0 +1,339 @@
+import json
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from blog.caching import bump_versions, post_cache_tags
+from blog.facets import index_facets
+from blog.fixture_stream import insert_raw
+from blog.forms import BoundedImageField
+from blog.models import Category, Comment, Location, Post, User
+from blog.renditions import has_renditions, schedule_renditions
+from blog.scheduler import refresh_next_publication
+from blog.search import index_posts
+from blog.sitemaps import invalidate_shards
+
+IMAGE_TIMEOUT = 30
+IMAGE_CHUNK_SIZE = 64 * 1024
+
+
+class RecordError(ValueError):
+    """A line of the import that cannot be turned into a post."""
+
+
+class LookupCache:
+    """Map natural keys to primary keys, querying only unseen keys."""
+
+    def __init__(self, model, field, defaults=None):
+        self.model = model
+        self.field = field
+        self.defaults = defaults
+        self.cache = {}
+
+    def resolve(self, keys):
+        missing = {
+            key for key in keys
+            if isinstance(key, str) and key and key not in self.cache
+        }
+        if not missing:
+            return
+        self.cache.update(self.model.objects.filter(
+            **{f'{self.field}__in': missing}
+        ).values_list(self.field, 'pk'))
+        for key in missing - self.cache.keys():
+            self.cache[key] = None
+            if self.defaults is not None:
+                self.cache[key] = self.model.objects.create(
+                    **{self.field: key}, **self.defaults(key)
+                ).pk
+
+    def get(self, key, required=False):
+        if not key:
+            if required:
+                raise RecordError(f'Не указано поле {self.field}.')
+            return None
+        pk = self.cache.get(key)
+        if pk is None:
+            raise RecordError(
+                f'{self.model._meta.verbose_name}: {key} не найдено.'
+            )
+        return pk
+
+
+def parse_date(value, default):
+    if not value:
+        return default
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise RecordError(f'Некорректная дата: {value}.')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _copy_limited(source, target, limit):
+    """Copy at most ``limit + 1`` bytes, enough to tell the file is big."""
+    while target.tell() <= limit:
+        chunk = source.read(min(IMAGE_CHUNK_SIZE, limit + 1 - target.tell()))
+        if not chunk:
+            break
+        target.write(chunk)
+
+
+def open_image_source(source, image_root):
+    if urlparse(source).scheme in ('http', 'https'):
+        return urlopen(source, timeout=IMAGE_TIMEOUT)
+    root = os.path.realpath(image_root)
+    path = os.path.realpath(os.path.join(root, source))
+    if os.path.commonpath([root, path]) != root:
+        raise RecordError(f'Путь вне каталога изображений: {source}.')
+    return open(path, 'rb')
+
+
+def fetch_image(source, image_root):
+    """Read an image from a path or URL into a checked temporary file.
+
+    The image goes through the same checks as one uploaded with the post
+    form, and reading stops as soon as it exceeds the size limit.
+    """
+    upload = TemporaryUploadedFile(
+        os.path.basename(urlparse(source).path), None, 0, None
+    )
+    try:
+        with open_image_source(source, image_root) as image:
+            _copy_limited(image, upload, settings.BLOG_IMAGE_MAX_BYTES)
+        upload.size = upload.tell()
+        upload.seek(0)
+        checked = BoundedImageField().clean(upload)
+    except ValidationError as error:
+        upload.close()
+        raise RecordError(' '.join(error.messages)) from error
+    except BaseException:
+        upload.close()
+        raise
+    if checked is not upload:
+        upload.close()
+    return checked
+
+
+def stage_image(source, image_root):
+    """Check an image and return the name it will have in storage."""
+    field = Post._meta.get_field('image')
+    upload = fetch_image(source, image_root)
+    target = field.generate_filename(None, upload.name)
+    return field.storage.hashed_name(target, upload), target, upload
+
+
+class PostImporter:
+    """Create posts and their comments from parsed JSONL records."""
+
+    def __init__(self, create_missing=False, image_root='.',
+                 image_workers=4):
+        self.users = LookupCache(
+            User, 'username',
+            (lambda key: {'password': '!'}) if create_missing else None
+        )
+        self.categories = LookupCache(
+            Category, 'slug',
+            (lambda key: {'title': key, 'description': ''})
+            if create_missing else None
+        )
+        self.locations = LookupCache(
+            Location, 'name', (lambda key: {}) if create_missing else None
+        )
+        self.image_root = image_root
+        self.image_workers = image_workers
+        self.errors = []
+
+    def resolve(self, records):
+        self.users.resolve(
+            [record.get('author') for record in records]
+            + [comment.get('author') for record in records
+               for comment in record.get('comments', ())
+               if isinstance(comment, dict)]
+        )
+        self.categories.resolve(
+            [record.get('category') for record in records]
+        )
+        self.locations.resolve(
+            [record.get('location') for record in records]
+        )
+
+    def build_post(self, record):
+        now = timezone.now()
+        if not record.get('title') or not record.get('text'):
+            raise RecordError('Не указаны заголовок или текст.')
+        post = Post(
+            title=record['title'],
+            text=record['text'],
+            pub_date=parse_date(record.get('pub_date'), now),
+            is_published=record.get('is_published', True),
+            author_id=self.users.get(record.get('author'), required=True),
+            category_id=self.categories.get(record.get('category')),
+            location_id=self.locations.get(record.get('location')),
+            comment_count=len(record.get('comments', ())),
+        )
+        post.fill_text_summary()
+        comments = [
+            self.build_comment(comment, now)
+            for comment in record.get('comments', ())
+        ]
+        return post, comments
+
+    def build_comment(self, comment, now):
+        if not comment.get('text'):
+            raise RecordError('Не указан текст комментария.')
+        return Comment(
+            text=comment['text'],
+            author_id=self.users.get(comment.get('author'), required=True),
+            created_at=parse_date(comment.get('created_at'), now),
+            is_published=comment.get('is_published', True),
+        )
+
+    def stage_images(self, entries):
+        """Fetch and check images, naming them without storing yet.
+
+        Return ``(target, upload)`` pairs for :meth:`store_images`.
+        """
+        with_images = [
+            (post, source) for post, source in entries if source
+        ]
+        if not with_images:
+            return []
+        if self.image_workers < 1:
+            staged = [self._stage(source) for _, source in with_images]
+        else:
+            with ThreadPoolExecutor(self.image_workers) as executor:
+                staged = list(executor.map(
+                    self._stage, [source for _, source in with_images]
+                ))
+        images = []
+        for (post, _), image in zip(with_images, staged):
+            if image is None:
+                continue
+            name, target, upload = image
+            post.image = name
+            images.append((target, upload))
+        return images
+
+    def _stage(self, source):
+        try:
+            return stage_image(source, self.image_root)
+        except (OSError, ValueError) as error:
+            self.errors.append(f'Изображение {source}: {error}')
+            return None
+
+    @staticmethod
+    def store_images(images):
+        storage = Post._meta.get_field('image').storage
+        for target, upload in images:
+            with upload:
+                storage.save(target, upload)
+
+    @staticmethod
+    def discard_images(images):
+        for _, upload in images:
+            upload.close()
+
+    def parse(self, lines):
+        records = []
+        for number, line in lines:
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise RecordError('Ожидался JSON-объект.')
+            except ValueError as error:
+                self.errors.append(f'Строка {number}: {error}')
+                continue
+            records.append((number, record))
+        return records
+
+    def build(self, records):
+        self.resolve([record for _, record in records])
+        entries = []
+        for number, record in records:
+            try:
+                post, comments = self.build_post(record)
+            except (ValueError, LookupError, TypeError,
+                    AttributeError) as error:
+                self.errors.append(f'Строка {number}: {error}')
+                continue
+            entries.append((post, comments, record.get('image')))
+        return entries
+
+    def import_batch(self, lines):
+        """Import ``(line_number, text)`` pairs; return created counts.
+
+        Images are written to storage only once the batch is committed,
+        so a failed batch leaves no files behind.
+        """
+        entries = self.build(self.parse(lines))
+        if not entries:
+            return 0, 0
+        images = self.stage_images(
+            [(post, image) for post, _, image in entries]
+        )
+        posts = [post for post, _, _ in entries]
+        comments = []
+        try:
+            with transaction.atomic():
+                self.insert_posts(posts)
+                for post, post_comments, _ in entries:
+                    for comment in post_comments:
+                        comment.post_id = post.pk
+                        comments.append(comment)
+                insert_raw(Comment, comments)
+                transaction.on_commit(lambda: self.store_images(images))
+        except BaseException:
+            self.discard_images(images)
+            raise
+        self.refresh(posts)
+        return len(posts), len(comments)
+
+    @staticmethod
+    def insert_posts(posts):
+        """Insert posts, with ids assigned by the database.
+
+        Backends that cannot return ids from a bulk insert get one insert
+        per post, still inside the batch transaction.
+        """
+        if connection.features.can_return_rows_from_bulk_insert:
+            Post.objects.bulk_create(posts)
+            return
+        fields = [
+            field for field in Post._meta.local_concrete_fields
+            if not field.primary_key
+        ]
+        for post in posts:
+            (post.pk,), = Post._base_manager._insert(
+                [post], fields=fields,
+                returning_fields=Post._meta.db_returning_fields
+            )
+            post._state.adding = False
+            post._state.db = connection.alias
+
+    @staticmethod
+    def refresh(posts):
+        """Do what ``post_save`` receivers do, once for the whole batch."""
+        ids = [post.pk for post in posts]
+        index_posts(ids)
+        index_facets(ids)
+        invalidate_shards('posts', ids)
+        bump_versions('posts', 'feed', *post_cache_tags(posts))
+        refresh_next_publication()
+        images = defaultdict(list)
+        for post in posts:
+            if post.image:
+                images[post.image.name].append(post.pk)
+        for name, post_ids in images.items():
+            if not has_renditions(name):
+                schedule_renditions(name, post_ids)
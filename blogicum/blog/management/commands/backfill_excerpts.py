@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает анонсы и время чтения публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Количество публикаций, сохраняемых за один запрос.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        batch = []
+        updated = 0
+        for post in Post.objects.only('text').iterator(chunk_size=batch_size):
+            post.fill_text_summary()
+            batch.append(post)
+            if len(batch) >= batch_size:
+                updated += self._flush(batch)
+        updated += self._flush(batch)
+        self.stdout.write(f'Обновлено публикаций: {updated}')
+
+    @staticmethod
+    def _flush(batch):
+        Post.objects.bulk_update(batch, ('excerpt', 'reading_time'))
+        flushed = len(batch)
+        batch.clear()
+        return flushed
@@ -0,0 +1,86 @@
+import os
+import posixpath
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.renditions import delete_renditions
+
+BATCH_SIZE = 500
+COLLECTED_SUFFIX = '.collected'
+
+
+def walk(storage, directory):
+    directories, files = storage.listdir(directory)
+    for name in files:
+        yield posixpath.join(directory, name)
+    for subdirectory in directories:
+        yield from walk(storage, posixpath.join(directory, subdirectory))
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет изображения публикаций, на которые не ссылается ни одна '
+        'публикация, вместе с их уменьшенными копиями.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace', type=int, default=settings.BLOG_IMAGE_GC_GRACE,
+            help=(
+                'Не трогать файлы, изменённые менее указанного числа '
+                'секунд назад.'
+            )
+        )
+
+    def handle(self, *args, **options):
+        field = Post._meta.get_field('image')
+        storage = field.storage
+        if not storage.exists(field.upload_to):
+            return
+        cutoff = time.time() - options['grace']
+        batch, deleted = [], 0
+        for name in walk(storage, field.upload_to):
+            if storage.get_modified_time(name).timestamp() > cutoff:
+                continue
+            batch.append(name)
+            if len(batch) == BATCH_SIZE:
+                deleted += self.collect(storage, batch, cutoff)
+                batch = []
+        deleted += self.collect(storage, batch, cutoff)
+        self.stdout.write(f'Удалено изображений: {deleted}')
+
+    @staticmethod
+    def collect(storage, names, cutoff):
+        """Delete the names no post refers to.
+
+        An upload of the same content refreshes the file's modification
+        time before its post is saved. Each file is therefore first moved
+        aside and checked again: an upload that touched it is seen by its
+        modification time, and an upload that comes after the move finds
+        no file and writes a new copy.
+        """
+        referenced = set(Post.objects.filter(image__in=names).values_list(
+            'image', flat=True
+        ))
+        deleted = 0
+        for name in names:
+            if name in referenced:
+                continue
+            path = storage.path(name)
+            collected = path + COLLECTED_SUFFIX
+            try:
+                os.replace(path, collected)
+            except FileNotFoundError:
+                continue
+            if os.path.getmtime(collected) > cutoff or (
+                Post.objects.filter(image=name).exists()
+            ):
+                os.replace(collected, path)
+                continue
+            os.remove(collected)
+            delete_renditions(name)
+            deleted += 1
+        return deleted
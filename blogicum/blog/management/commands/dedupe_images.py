@@ -0,0 +1,47 @@
+import re
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.caching import bump_versions, invalidate_post_cards
+from blog.models import Post
+from blog.renditions import delete_renditions
+
+HASHED_NAME = re.compile(r'(^|/)[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.\w*$')
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит изображения публикаций в хранилище с адресацией '
+        'по содержимому и удаляет дубликаты.'
+    )
+
+    def handle(self, *args, **options):
+        storage = Post._meta.get_field('image').storage
+        names = list(Post.objects.exclude(image='').values_list(
+            'image', flat=True
+        ).distinct())
+        moved, stored = 0, set()
+        for name in names:
+            if HASHED_NAME.search(name) or not storage.exists(name):
+                continue
+            with storage.open(name, 'rb') as image:
+                hashed = storage.save(name, image)
+            with transaction.atomic():
+                posts = list(
+                    Post.objects.filter(image=name).values_list(
+                        'pk', flat=True
+                    )
+                )
+                Post.objects.filter(pk__in=posts).update(image=hashed)
+            storage.delete(name)
+            delete_renditions(name)
+            invalidate_post_cards(posts)
+            bump_versions(*(f'post:{pk}' for pk in posts))
+            moved += 1
+            stored.add(hashed)
+        self.stdout.write(
+            f'Перенесено изображений: {moved}, '
+            f'уникальных файлов: {len(stored)}. '
+            'Уменьшенные копии создаёт команда generate_renditions.'
+        )
@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from blog.caching import bump_versions, invalidate_post_cards
+from blog.models import Post
+from blog.renditions import generate_renditions, has_renditions
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии изображений публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=4,
+            help='Количество потоков для обработки изображений.'
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Пересоздать уже существующие копии.'
+        )
+
+    def handle(self, *args, **options):
+        images = {}
+        rows = Post.objects.exclude(image='').values_list('image', 'pk')
+        for name, pk in rows.iterator():
+            images.setdefault(name, []).append(pk)
+        if not options['force']:
+            images = {
+                name: pks for name, pks in images.items()
+                if not has_renditions(name)
+            }
+        with ThreadPoolExecutor(max(options['workers'], 1)) as executor:
+            results = executor.map(self.render, images)
+            rendered = [
+                name for name, done in zip(images, results) if done
+            ]
+        post_ids = [pk for name in rendered for pk in images[name]]
+        invalidate_post_cards(post_ids)
+        bump_versions(*(f'post:{pk}' for pk in post_ids))
+        self.stdout.write(
+            f'Обработано изображений: {len(rendered)} из {len(images)}'
+        )
+
+    def render(self, name):
+        try:
+            generate_renditions(name)
+        except (OSError, ValueError) as error:
+            self.stderr.write(f'{name}: {error}')
+            return False
+        return True
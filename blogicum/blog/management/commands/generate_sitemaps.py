@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from blog.sitemaps import SITEMAPS, shard_path, write_shard
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерирует недостающие части карты сайта; '
+        'с --force перегенерирует все.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Перегенерировать и уже сохранённые части.'
+        )
+
+    def handle(self, *args, **options):
+        written = 0
+        for name, sitemap in SITEMAPS.items():
+            for shard in range(sitemap.shard_count()):
+                if (
+                    options['force']
+                    or not shard_path(name, shard).exists()
+                ):
+                    write_shard(name, shard).close()
+                    written += 1
+        self.stdout.write(f'Сгенерировано частей карты сайта: {written}')
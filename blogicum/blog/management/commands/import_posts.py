@@ -0,0 +1,67 @@
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+
+from blog.importing import PostImporter
+
+
+class Command(BaseCommand):
+    help = (
+        'Импортирует публикации и комментарии из файла JSON Lines '
+        'пакетными вставками.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'source', help='Путь к файлу, по одной публикации в строке.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Количество публикаций, записываемых в одной транзакции.'
+        )
+        parser.add_argument(
+            '--image-root', default='.',
+            help='Каталог, относительно которого указаны пути изображений.'
+        )
+        parser.add_argument(
+            '--image-workers', type=int, default=4,
+            help='Количество потоков для загрузки изображений.'
+        )
+        parser.add_argument(
+            '--create-missing', action='store_true',
+            help='Создавать отсутствующих авторов, категории и местоположения.'
+        )
+
+    def handle(self, *args, **options):
+        importer = PostImporter(
+            create_missing=options['create_missing'],
+            image_root=options['image_root'],
+            image_workers=options['image_workers'],
+        )
+        started = time.monotonic()
+        posts = comments = 0
+        with open(options['source'], encoding='utf-8') as source:
+            lines = (
+                (number, line) for number, line in enumerate(source, 1)
+                if line.strip()
+            )
+            while True:
+                batch = list(islice(lines, max(options['batch_size'], 1)))
+                if not batch:
+                    break
+                created = importer.import_batch(batch)
+                posts += created[0]
+                comments += created[1]
+                self.report_errors(importer)
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f'Импортировано публикаций: {posts}, комментариев: {comments} '
+            f'за {elapsed:.2f} с ({posts / max(elapsed, 1e-6):.1f} '
+            'публикаций/с)'
+        )
+
+    def report_errors(self, importer):
+        for error in importer.errors:
+            self.stderr.write(error)
+        importer.errors.clear()
@@ -0,0 +1,52 @@
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from blog.scheduler import publish_due_posts, seconds_until_next_publication
+
+
+class Command(BaseCommand):
+    help = (
+        'Следит за отложенными публикациями и сбрасывает кеши '
+        'в момент их выхода; периодически удаляет неиспользуемые '
+        'изображения.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help=(
+                'Обработать наступившие публикации, удалить неиспользуемые '
+                'изображения и завершиться.'
+            )
+        )
+        parser.add_argument(
+            '--max-sleep', type=float, default=60,
+            help='Наибольшая пауза между проверками, в секундах.'
+        )
+
+    def handle(self, *args, **options):
+        collected_at = None
+        while True:
+            for post in publish_due_posts():
+                self.stdout.write(f'Опубликован пост {post.pk}: {post}')
+            collected_at = self.collect_images(collected_at)
+            if options['once']:
+                break
+            seconds = seconds_until_next_publication()
+            if seconds is None:
+                seconds = options['max_sleep']
+            time.sleep(max(0.1, min(seconds, options['max_sleep'])))
+
+    def collect_images(self, collected_at):
+        """Run collect_images every ``BLOG_IMAGE_GC_INTERVAL`` seconds."""
+        interval = settings.BLOG_IMAGE_GC_INTERVAL
+        now = time.monotonic()
+        if not interval or (
+            collected_at is not None and now - collected_at < interval
+        ):
+            return collected_at
+        call_command('collect_images', stdout=self.stdout)
+        return now
@@ -0,0 +1,46 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from blog.fixture_stream import dump_objects, get_dump_models
+
+
+class Command(BaseCommand):
+    help = 'Потоково выгружает данные в формате dumpdata.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'labels', nargs='*',
+            help='Приложения или модели (app_label.Model) для выгрузки.'
+        )
+        parser.add_argument(
+            '-e', '--exclude', action='append', default=[],
+            help='Приложение или модель, которые не нужно выгружать.'
+        )
+        parser.add_argument(
+            '--indent', type=int, default=None,
+            help='Отступ для форматирования JSON.'
+        )
+        parser.add_argument(
+            '-o', '--output',
+            help='Файл для записи; по умолчанию — стандартный вывод.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Количество объектов, читаемых за один запрос.'
+        )
+
+    def handle(self, *args, **options):
+        models = get_dump_models(options['labels'], options['exclude'])
+        stream = (
+            open(options['output'], 'w', encoding='utf-8')
+            if options['output'] else sys.stdout
+        )
+        try:
+            dump_objects(
+                stream, models, indent=options['indent'],
+                batch_size=options['batch_size']
+            )
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from blog.caching import BULK_TAG, bump_versions
+from blog.fixture_stream import StreamLoader, iter_json_array
+from blog.models import Comment, Post
+from blog.scheduler import refresh_next_publication
+from blog.sitemaps import SITEMAPS, invalidate_shards
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково загружает фикстуру в формате dumpdata пакетными '
+        'вставками.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixture', help='Путь к JSON-фикстуре.')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Количество объектов, записываемых одним пакетом.'
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        loader = StreamLoader(batch_size=options['batch_size'])
+        with open(options['fixture'], encoding='utf-8') as fixture:
+            counts = loader.load(iter_json_array(fixture))
+        self.refresh(loader.loaded)
+        total = sum(counts.values())
+        self.stdout.write(
+            f'Загружено объектов: {total} '
+            f'за {time.monotonic() - started:.2f} с'
+        )
+
+    def refresh(self, loaded):
+        if Post in loaded or Comment in loaded:
+            Post.objects.refresh_comment_count()
+        if Post in loaded:
+            call_command('backfill_excerpts', stdout=self.stdout)
+            call_command('rebuild_search_index', stdout=self.stdout)
+        bump_versions('posts', 'feed', BULK_TAG)
+        refresh_next_publication()
+        for name in SITEMAPS:
+            invalidate_shards(name)
@@ -0,0 +1,41 @@
+from math import ceil
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+BATCH_SIZE = 500
+
+
+def fill_excerpt(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    batch = []
+    for post in Post.objects.only('text').iterator(chunk_size=BATCH_SIZE):
+        post.excerpt = Truncator(post.text).words(10, truncate=' …')
+        post.reading_time = max(1, ceil(len(post.text.split()) / 200))
+        batch.append(post)
+        if len(batch) >= BATCH_SIZE:
+            Post.objects.bulk_update(batch, ('excerpt', 'reading_time'))
+            batch.clear()
+    Post.objects.bulk_update(batch, ('excerpt', 'reading_time'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0017_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, verbose_name='Анонс'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=1, editable=False, verbose_name='Время чтения, мин'),
+        ),
+        migrations.RunPython(fill_excerpt, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+from django.db import migrations
+
+from blog.stemmer import stem_words
+
+# Frozen copy of the search table definition; existing posts are indexed
+# with the application's stemmer, as the rebuild_search_index command
+# does.
+CREATE_SEARCH_TABLE = (
+    'CREATE VIRTUAL TABLE blog_post_search USING fts5('
+    "title, text, tokenize = 'unicode61 remove_diacritics 2')"
+)
+DROP_SEARCH_TABLE = 'DROP TABLE blog_post_search'
+INSERT_ROWS = (
+    'INSERT INTO blog_post_search (rowid, title, text) VALUES (%s, %s, %s)'
+)
+BATCH_SIZE = 500
+
+
+def create_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(CREATE_SEARCH_TABLE)
+
+
+def index_existing_posts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    Post = apps.get_model('blog', 'Post')
+    rows = Post.objects.order_by().values_list(
+        'id', 'title', 'text'
+    ).iterator(chunk_size=BATCH_SIZE)
+    with schema_editor.connection.cursor() as cursor:
+        batch = []
+        for pk, title, text in rows:
+            batch.append(
+                (pk, ' '.join(stem_words(title)), ' '.join(stem_words(text)))
+            )
+            if len(batch) == BATCH_SIZE:
+                cursor.executemany(INSERT_ROWS, batch)
+                batch = []
+        cursor.executemany(INSERT_ROWS, batch)
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(DROP_SEARCH_TABLE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0019_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+        migrations.RunPython(index_existing_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def fill_facets(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    PostFacet = apps.get_model('blog', 'PostFacet')
+    bitmaps = defaultdict(bytearray)
+    rows = Post.objects.order_by().values_list(
+        'id', 'category_id', 'location_id'
+    ).iterator(chunk_size=500)
+    for pk, *values in rows:
+        for facet, value in zip(('category', 'location'), values):
+            if value is None:
+                continue
+            bits = bitmaps[facet, value]
+            if len(bits) <= pk >> 3:
+                bits.extend(bytes((pk >> 3) + 1 - len(bits)))
+            bits[pk >> 3] |= 1 << (pk & 7)
+    PostFacet.objects.bulk_create(
+        [
+            PostFacet(facet=facet, value=value, bitmap=bytes(bits))
+            for (facet, value), bits in bitmaps.items()
+        ],
+        batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0021_post_image_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(choices=[('category', 'Категория'), ('location', 'Местоположение')], max_length=16, verbose_name='Фасет')),
+                ('value', models.PositiveIntegerField(verbose_name='Значение')),
+                ('bitmap', models.BinaryField(default=b'', verbose_name='Битовая карта')),
+            ],
+            options={
+                'verbose_name': 'фасет публикаций',
+                'verbose_name_plural': 'Фасеты публикаций',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='postfacet',
+            constraint=models.UniqueConstraint(fields=('facet', 'value'), name='post_facet_unique'),
+        ),
+        migrations.RunPython(fill_facets, migrations.RunPython.noop),
+    ]
@@ -1,16 +1,25 @@
+from math import ceil
+
 from django.db import models
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django.utils.text import Truncator
 
-from core.models import PublishedModel
+from blog.storage import ContentAddressedStorage
+from core.models import PublishedModel, TimestampedModel
 
 MAX_LENGTH_TITLE = 256
 MAX_LENGTH_SLUG = 64
 MAX_LENGTH_STR_TITLE = 10
 MAX_LENGTH_STR_TEXT = 20
+EXCERPT_WORDS = 10
+WORDS_PER_MINUTE = 200
 User = get_user_model()
 
 
-class Category(PublishedModel):
+class Category(TimestampedModel):
     title = models.CharField(
         max_length=MAX_LENGTH_TITLE,
         verbose_name='Заголовок'
@@ -37,7 +46,7 @@ class Category(PublishedModel):
         return self.title[:MAX_LENGTH_STR_TITLE]
 
 
-class Location(PublishedModel):
+class Location(TimestampedModel):
     name = models.CharField(
         max_length=MAX_LENGTH_TITLE,
         verbose_name='Название места',
@@ -52,7 +61,58 @@ class Location(PublishedModel):
         return self.name[:MAX_LENGTH_STR_TITLE]
 
 
-class Post(PublishedModel):
+class PostQuerySet(models.QuerySet):
+
+    def published(self):
+        return self.filter(
+            is_published=True,
+            category__is_published=True,
+            pub_date__lte=timezone.now()
+        )
+
+    def scheduled(self):
+        return self.filter(
+            is_published=True,
+            category__is_published=True,
+            pub_date__gt=timezone.now()
+        )
+
+    def with_related(self):
+        return self.select_related('author', 'category', 'location')
+
+    def visible_to(self, user):
+        visible = Q(is_published=True)
+        if user.is_authenticated:
+            visible |= Q(author=user)
+        return self.filter(visible)
+
+    def feed(self):
+        return self.with_related().defer('text').order_by(
+            '-pub_date', '-id'
+        )
+
+    def published_feed(self):
+        return self.published().feed()
+
+    def for_category(self, category):
+        return self.filter(category=category).published_feed()
+
+    def for_author(self, author, include_hidden=False):
+        posts = self.filter(author=author)
+        if not include_hidden:
+            posts = posts.published()
+        return posts.feed()
+
+    def refresh_comment_count(self):
+        counts = Comment.objects.filter(
+            post=OuterRef('pk')
+        ).order_by().values('post').annotate(
+            total=Count('pk')
+        ).values('total')
+        return self.update(comment_count=Coalesce(Subquery(counts), 0))
+
+
+class Post(TimestampedModel):
     title = models.CharField(
         max_length=MAX_LENGTH_TITLE,
         verbose_name='Заголовок',
@@ -87,7 +147,8 @@ class Post(PublishedModel):
         verbose_name='Автор публикации',
         on_delete=models.CASCADE,
         related_name='posts',
-        blank=False
+        blank=False,
+        db_index=False
     )
 
     location = models.ForeignKey(
@@ -106,16 +167,74 @@ class Post(PublishedModel):
         null=True
     )
 
-    image = models.ImageField('Фото', upload_to='post_images', blank=True)
+    image = models.ImageField(
+        'Фото',
+        upload_to='post_images',
+        storage=ContentAddressedStorage(),
+        blank=True
+    )
+
+    comment_count = models.PositiveIntegerField(
+        verbose_name='Комментарии',
+        default=0,
+        editable=False
+    )
+
+    excerpt = models.TextField(
+        verbose_name='Анонс',
+        blank=True,
+        editable=False
+    )
+
+    reading_time = models.PositiveSmallIntegerField(
+        verbose_name='Время чтения, мин',
+        default=1,
+        editable=False
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('pub_date',),
+                condition=Q(is_published=True),
+                name='post_feed_idx'
+            ),
+            models.Index(
+                fields=('category', 'pub_date'),
+                condition=Q(is_published=True),
+                name='post_category_feed_idx'
+            ),
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='post_author_feed_idx'
+            ),
+            models.Index(fields=('image',), name='post_image_idx'),
+        )
 
     def __str__(self):
         return self.title[:MAX_LENGTH_STR_TITLE]
 
+    def save(self, *args, **kwargs):
+        if 'text' not in self.get_deferred_fields():
+            self.fill_text_summary()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'text' in update_fields:
+                kwargs['update_fields'] = {
+                    *update_fields, 'excerpt', 'reading_time'
+                }
+        super().save(*args, **kwargs)
+
+    def fill_text_summary(self):
+        self.excerpt = Truncator(self.text).words(EXCERPT_WORDS, truncate=' …')
+        self.reading_time = max(
+            1, ceil(len(self.text.split()) / WORDS_PER_MINUTE)
+        )
+
 
 class Comment(PublishedModel):
     text = models.TextField(
@@ -137,13 +256,51 @@ class Comment(PublishedModel):
         on_delete=models.SET_NULL,
         related_name='comments',
         verbose_name='Пост',
-        null=True
+        null=True,
+        db_index=False
     )
 
     class Meta:
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx'
+            ),
+        )
 
     def __str__(self):
         return self.text[:MAX_LENGTH_STR_TEXT]
+
+
+class PostFacet(models.Model):
+    """Bitmap of the ids of posts with one category or one location."""
+
+    CATEGORY = 'category'
+    LOCATION = 'location'
+    FACETS = (
+        (CATEGORY, 'Категория'),
+        (LOCATION, 'Местоположение'),
+    )
+
+    facet = models.CharField(
+        max_length=16,
+        choices=FACETS,
+        verbose_name='Фасет'
+    )
+    value = models.PositiveIntegerField(verbose_name='Значение')
+    bitmap = models.BinaryField(default=b'', verbose_name='Битовая карта')
+
+    class Meta:
+        verbose_name = 'фасет публикаций'
+        verbose_name_plural = 'Фасеты публикаций'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('facet', 'value'), name='post_facet_unique'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.facet}:{self.value}'
@@ -0,0 +1,189 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from blog.caching import get_version
+from blog.scheduler import scheduled_timeout
+
+FORWARD = 'f'
+BACKWARD = 'b'
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+class FeedPage(Page):
+
+    @property
+    def elided_page_range(self):
+        return [
+            None if number == self.paginator.ELLIPSIS else number
+            for number in self.paginator.get_elided_page_range(
+                self.number,
+                on_each_side=self.paginator.on_each_side,
+                on_ends=self.paginator.on_ends
+            )
+        ]
+
+
+class FeedPaginator(Paginator):
+    """Numbered paginator that shares its COUNT(*) between requests.
+
+    The count is cached under ``count_cache_key`` until any post changes;
+    pages expose ``elided_page_range`` so templates render a fixed-size
+    window instead of the whole ``page_range``.
+    """
+
+    on_each_side = 2
+    on_ends = 1
+
+    def __init__(self, *args, count_cache_key=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_cache_key = count_cache_key
+
+    @cached_property
+    def count(self):
+        if self.count_cache_key is None:
+            return super().count
+        key = 'blog:count:{}:{}'.format(
+            self.count_cache_key, get_version('posts')
+        )
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, scheduled_timeout(
+                settings.BLOG_PAGINATOR_COUNT_TIMEOUT
+            ))
+        return count
+
+    def _get_page(self, *args, **kwargs):
+        return FeedPage(*args, **kwargs)
+
+
+class KeysetPage(Sequence):
+    is_keyset = True
+
+    def __init__(self, object_list, paginator,
+                 next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return '<Keyset page of %s objects>' % len(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """Seek pagination over a fixed, unique ordering.
+
+    Pages are addressed by opaque cursors instead of numbers, so neither
+    OFFSET nor COUNT(*) is ever issued: every page is one indexed range
+    scan of ``per_page + 1`` rows.
+    """
+
+    def __init__(self, object_list, per_page, ordering=('-pub_date', '-id')):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = [
+            (field.lstrip('-'), field.startswith('-')) for field in ordering
+        ]
+
+    def encode_cursor(self, direction, row):
+        values = [self._serialize(self._get_value(row, name))
+                  for name, _ in self.ordering]
+        payload = json.dumps([direction, values], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            direction, values = json.loads(base64.urlsafe_b64decode(padded))
+            if direction not in (FORWARD, BACKWARD):
+                raise ValueError
+            if len(values) != len(self.ordering):
+                raise ValueError
+            return direction, [
+                self.to_python(name, value)
+                for (name, _), value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, binascii.Error,
+                ValidationError) as error:
+            raise InvalidCursor('Некорректный курсор') from error
+
+    def to_python(self, name, value):
+        return self.object_list.model._meta.get_field(name).to_python(value)
+
+    def page(self, cursor=None):
+        if cursor:
+            direction, values = self.decode_cursor(cursor)
+        else:
+            direction, values = FORWARD, None
+        backward = direction == BACKWARD
+        queryset = self.object_list.order_by(*self._order_by(backward))
+        if values is not None:
+            queryset = queryset.filter(self._seek_filter(values, backward))
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backward:
+            rows.reverse()
+        if not rows:
+            return KeysetPage(rows, self)
+        next_cursor = previous_cursor = None
+        if has_more or backward:
+            next_cursor = self.encode_cursor(FORWARD, rows[-1])
+        if (has_more and backward) or (values is not None and not backward):
+            previous_cursor = self.encode_cursor(BACKWARD, rows[0])
+        return KeysetPage(rows, self, next_cursor, previous_cursor)
+
+    def _order_by(self, backward):
+        return [
+            '-' + name if descending != backward else name
+            for name, descending in self.ordering
+        ]
+
+    def _seek_filter(self, values, backward):
+        condition = Q()
+        equal = {}
+        for (name, descending), value in zip(self.ordering, values):
+            lookup = 'lt' if descending != backward else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    @staticmethod
+    def _get_value(row, name):
+        if isinstance(row, dict):
+            return row[name]
+        return getattr(row, name)
+
+    @staticmethod
+    def _serialize(value):
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        return value
@@ -0,0 +1,164 @@
+import json
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps
+
+from blog.caching import bump_versions, invalidate_post_cards
+from blog.models import Post
+
+logger = logging.getLogger(__name__)
+
+RENDITION_DIR = 'renditions'
+MANIFEST_KEY = 'blog:renditions:{}'
+MISSING_MANIFEST_TIMEOUT = 10
+FORMATS = {
+    'webp': ('WEBP', 'image/webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'image/jpeg', {'quality': 82, 'optimize': True}),
+}
+
+_executor = None
+
+
+def rendition_name(name, width, extension):
+    stem = posixpath.splitext(name)[0]
+    return posixpath.join(RENDITION_DIR, f'{stem}-{width}.{extension}')
+
+
+def manifest_name(name):
+    return posixpath.join(
+        RENDITION_DIR, f'{posixpath.splitext(name)[0]}.json'
+    )
+
+
+def _encode(image, extension):
+    image_format, _, options = FORMATS[extension]
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def _replace(name, content):
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    return default_storage.save(name, content)
+
+
+def generate_renditions(name):
+    """Write resized copies of an uploaded image and their manifest.
+
+    Widths larger than the original are skipped; the original width is
+    always rendered, so every image has at least one rendition per
+    format. Only storage is touched, which keeps it safe for threads.
+    """
+    storage = Post._meta.get_field('image').storage
+    with storage.open(name, 'rb') as source:
+        image = Image.open(source)
+        width, height = image.size
+        if width * height > settings.BLOG_IMAGE_MAX_PIXELS:
+            raise ValueError(f'Слишком большое изображение: {width}×{height}')
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    width, height = image.size
+    widths = sorted({
+        min(candidate, width) for candidate in settings.BLOG_IMAGE_WIDTHS
+    })
+    manifest = {'width': width, 'height': height, 'sources': {}}
+    for extension in FORMATS:
+        sources = []
+        for target in widths:
+            resized = image.resize(
+                (target, max(round(height * target / width), 1)),
+                Image.Resampling.LANCZOS
+            ) if target != width else image
+            sources.append((
+                _replace(
+                    rendition_name(name, target, extension),
+                    _encode(resized, extension)
+                ),
+                target,
+            ))
+        manifest['sources'][extension] = sources
+    _replace(manifest_name(name), ContentFile(json.dumps(manifest)))
+    cache.delete(MANIFEST_KEY.format(name))
+    return manifest
+
+
+def get_manifest(name):
+    """Return the renditions manifest of an image, or None if not ready.
+
+    A missing manifest is remembered only briefly, so renditions made
+    elsewhere, e.g. by generate_renditions, are picked up soon.
+    """
+    key = MANIFEST_KEY.format(name)
+    manifest = cache.get(key)
+    if manifest is None:
+        try:
+            with default_storage.open(manifest_name(name), 'rb') as stored:
+                manifest = json.load(stored)
+        except (OSError, ValueError):
+            manifest = False
+        cache.set(key, manifest, (
+            settings.BLOG_POST_CARD_TIMEOUT if manifest
+            else MISSING_MANIFEST_TIMEOUT
+        ))
+    return manifest or None
+
+
+def delete_renditions(name):
+    manifest = get_manifest(name)
+    if manifest is not None:
+        for sources in manifest['sources'].values():
+            for rendition, _ in sources:
+                default_storage.delete(rendition)
+    default_storage.delete(manifest_name(name))
+    cache.delete(MANIFEST_KEY.format(name))
+
+
+def has_renditions(name):
+    return default_storage.exists(manifest_name(name))
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            settings.BLOG_IMAGE_WORKERS, thread_name_prefix='renditions'
+        )
+    return _executor
+
+
+def _render(name, post_ids):
+    try:
+        generate_renditions(name)
+    except Exception:
+        logger.exception('Не удалось создать копии изображения %s', name)
+        return
+    invalidate_post_cards(post_ids)
+    bump_versions(*(f'post:{pk}' for pk in post_ids))
+
+
+def schedule_renditions(name, post_ids=()):
+    """Render an image in the worker pool once the transaction commits.
+
+    With ``BLOG_IMAGE_WORKERS = 0`` renditions are made synchronously.
+    The pool lives in the process, so work queued when it stops is lost;
+    the generate_renditions command renders every image still missing
+    its renditions and is the way to recover.
+    """
+    post_ids = list(post_ids)
+    if settings.BLOG_IMAGE_WORKERS < 1:
+        transaction.on_commit(lambda: _render(name, post_ids))
+    else:
+        transaction.on_commit(
+            lambda: get_executor().submit(_render, name, post_ids)
+        )
@@ -0,0 +1,78 @@
+from math import ceil
+
+from django.core.cache import cache
+from django.dispatch import Signal
+from django.utils import timezone
+
+from blog.models import Post
+
+NEXT_PUBLICATION_KEY = 'blog:scheduler:next_publication'
+CHECKED_AT_KEY = 'blog:scheduler:checked_at'
+LOCK_KEY = 'blog:scheduler:lock'
+LOCK_TIMEOUT = 30
+
+post_published = Signal()
+
+
+def next_publication_at():
+    """Return the pub_date of the nearest scheduled visible post or None."""
+    entry = cache.get(NEXT_PUBLICATION_KEY)
+    if entry is None:
+        return refresh_next_publication()
+    return entry[0]
+
+
+def refresh_next_publication():
+    """Recompute the nearest scheduled pub_date and store it in the cache.
+
+    Called on writes, so that reads keep finding the value in the cache.
+    """
+    pub_date = Post.objects.scheduled().order_by(
+        'pub_date'
+    ).values_list('pub_date', flat=True).first()
+    cache.set(NEXT_PUBLICATION_KEY, (pub_date,), None)
+    return pub_date
+
+
+def seconds_until_next_publication():
+    pub_date = next_publication_at()
+    if pub_date is None:
+        return None
+    return max(0, (pub_date - timezone.now()).total_seconds())
+
+
+def scheduled_timeout(timeout):
+    """Cap a feed cache timeout so the entry expires when a post goes live."""
+    seconds = seconds_until_next_publication()
+    if seconds is None:
+        return timeout
+    return max(1, min(timeout, ceil(seconds)))
+
+
+def publish_due_posts():
+    """Send ``post_published`` for scheduled posts that have gone live.
+
+    Cheap when nothing is due: a single cache read. Only one process
+    handles a given moment thanks to a short cache lock.
+    """
+    pub_date = next_publication_at()
+    now = timezone.now()
+    if pub_date is None or pub_date > now:
+        return []
+    if not cache.add(LOCK_KEY, True, LOCK_TIMEOUT):
+        return []
+    try:
+        checked_at = cache.get(CHECKED_AT_KEY)
+        posts = Post.objects.published().filter(pub_date__lte=now)
+        if checked_at is not None:
+            posts = posts.filter(pub_date__gt=checked_at)
+        else:
+            posts = posts.filter(pub_date__gte=pub_date)
+        posts = list(posts.order_by('pub_date', 'id'))
+        for post in posts:
+            post_published.send(sender=Post, post=post)
+        cache.set(CHECKED_AT_KEY, now, None)
+        refresh_next_publication()
+    finally:
+        cache.delete(LOCK_KEY)
+    return posts
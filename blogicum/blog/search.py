@@ -0,0 +1,183 @@
+from collections import namedtuple
+
+from django.db import connection
+from django.utils import timezone
+
+from blog.facets import FacetIndex, bitmap
+from blog.models import Category, Post, PostFacet
+from blog.paginators import (
+    FORWARD, InvalidCursor, KeysetPage, KeysetPaginator
+)
+from blog.stemmer import stem_words
+
+SEARCH_TABLE = 'blog_post_search'
+TITLE_WEIGHT = 10.0
+TEXT_WEIGHT = 1.0
+MAX_QUERY_TERMS = 8
+
+SearchResult = namedtuple('SearchResult', 'rows categories locations')
+
+
+def build_match(query):
+    terms = list(dict.fromkeys(stem_words(query)))[:MAX_QUERY_TERMS]
+    return ' '.join(f'"{term}"' for term in terms)
+
+
+def visible_matches(match):
+    """FROM and WHERE clauses of visible posts matching an FTS query.
+
+    Returned with their parameters. Visible posts are published, belong
+    to a published category and are dated no later than now.
+    """
+    post_table = Post._meta.db_table
+    category_table = Category._meta.db_table
+    sql = f'''
+        FROM {SEARCH_TABLE}
+        JOIN {post_table} ON {post_table}.id = {SEARCH_TABLE}.rowid
+        JOIN {category_table}
+            ON {category_table}.id = {post_table}.category_id
+        WHERE {SEARCH_TABLE} MATCH %s
+            AND {post_table}.is_published
+            AND {category_table}.is_published
+            AND {post_table}.pub_date <= %s
+    '''
+    return sql, [match, connection.ops.adapt_datetimefield_value(
+        timezone.now()
+    )]
+
+
+def find_posts(query, after=None, limit=10, category_id=None,
+               location_id=None):
+    """Rank visible posts matching the query and count them per facet.
+
+    One FTS query selects every visible match ranked by bm25, with title
+    matches weighted higher; the match set is then intersected with the
+    facet bitmaps. ``rows`` hold ``score`` and ``id`` of up to ``limit``
+    matches in the chosen category and location, ordered by
+    ``(score, id)`` and continuing after ``after``. Each facet is counted
+    with the other facet's filter applied, so the numbers show how many
+    results a click on that value would give.
+    """
+    match = build_match(query)
+    if not match:
+        return SearchResult([], {}, {})
+    matches, params = visible_matches(match)
+    with connection.cursor() as cursor:
+        cursor.execute(f'''
+            SELECT
+                bm25({SEARCH_TABLE}, {TITLE_WEIGHT}, {TEXT_WEIGHT}) AS score,
+                {SEARCH_TABLE}.rowid AS id
+            {matches}
+            ORDER BY score, id
+        ''', params)
+        hits = cursor.fetchall()
+    index = FacetIndex.load()
+    in_category = in_location = bitmap(pk for _, pk in hits)
+    if category_id is not None:
+        in_category &= index.get(PostFacet.CATEGORY, category_id)
+    if location_id is not None:
+        in_location &= index.get(PostFacet.LOCATION, location_id)
+    selected = in_category & in_location
+    if after is not None:
+        after = tuple(after)
+    rows = []
+    for score, pk in hits:
+        if len(rows) == limit:
+            break
+        if selected >> pk & 1 and (after is None or (score, pk) > after):
+            rows.append({'score': score, 'id': pk})
+    return SearchResult(
+        rows,
+        index.count(PostFacet.CATEGORY, in_location),
+        index.count(PostFacet.LOCATION, in_category),
+    )
+
+
+def _index_rows(rows):
+    return [
+        (pk, ' '.join(stem_words(title)), ' '.join(stem_words(text)))
+        for pk, title, text in rows
+    ]
+
+
+def index_posts(post_ids):
+    post_ids = list(post_ids)
+    rows = Post.objects.filter(pk__in=post_ids).values_list(
+        'id', 'title', 'text'
+    )
+    remove_posts(post_ids)
+    with connection.cursor() as cursor:
+        _insert_batch(cursor, list(rows))
+
+
+def remove_posts(post_ids):
+    post_ids = list(post_ids)
+    if not post_ids:
+        return
+    placeholders = ', '.join(['%s'] * len(post_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})',
+            post_ids
+        )
+
+
+def rebuild_index(batch_size=500):
+    rows = Post.objects.order_by().values_list(
+        'id', 'title', 'text'
+    ).iterator(chunk_size=batch_size)
+    total = 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                total += _insert_batch(cursor, batch)
+                batch = []
+        total += _insert_batch(cursor, batch)
+    return total
+
+
+def _insert_batch(cursor, batch):
+    cursor.executemany(
+        f'INSERT INTO {SEARCH_TABLE} (rowid, title, text) '
+        'VALUES (%s, %s, %s)',
+        _index_rows(batch)
+    )
+    return len(batch)
+
+
+class SearchPaginator(KeysetPaginator):
+    """Forward-only keyset pagination over ranked search results."""
+
+    def __init__(self, object_list, query, per_page, **filters):
+        super().__init__(object_list, per_page, ordering=('score', 'id'))
+        self.query = query
+        self.filters = filters
+        self.facet_counts = ({}, {})
+
+    def to_python(self, name, value):
+        return float(value) if name == 'score' else int(value)
+
+    def page(self, cursor=None):
+        values = None
+        if cursor:
+            direction, values = self.decode_cursor(cursor)
+            if direction != FORWARD:
+                raise InvalidCursor('Некорректный курсор')
+        result = find_posts(
+            self.query, values, self.per_page + 1, **self.filters
+        )
+        self.facet_counts = result.categories, result.locations
+        rows = result.rows
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        posts = self.object_list.in_bulk([row['id'] for row in rows])
+        next_cursor = None
+        if has_more:
+            next_cursor = self.encode_cursor(FORWARD, rows[-1])
+        return KeysetPage(
+            [posts[row['id']] for row in rows if row['id'] in posts],
+            self, next_cursor
+        )
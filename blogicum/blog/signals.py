@@ -0,0 +1,167 @@
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from blog.caching import (
+    bump_versions, invalidate_post_cards, post_cache_tags
+)
+from blog.facets import (
+    drop_facet, move_post, post_facets, stored_facets, update_facets
+)
+from blog.models import Category, Comment, Location, Post, PostFacet, User
+from blog.renditions import has_renditions, schedule_renditions
+from blog.scheduler import post_published, refresh_next_publication
+from blog.search import index_posts, remove_posts
+from blog.sitemaps import invalidate_shards
+
+
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=Location)
+@receiver(pre_save, sender=Post)
+def fill_updated_at(sender, instance, raw=False, **kwargs):
+    if raw and instance.updated_at is None:
+        instance.updated_at = instance.created_at or timezone.now()
+
+
+@receiver(post_save, sender=Comment)
+def update_commented_post(sender, instance, created, raw=False, **kwargs):
+    if not raw and instance.post_id:
+        changes = {'updated_at': timezone.now()}
+        if created:
+            changes['comment_count'] = F('comment_count') + 1
+        Post.objects.filter(pk=instance.post_id).update(**changes)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    if instance.post_id:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=Greatest(F('comment_count') - 1, 0),
+            updated_at=timezone.now()
+        )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def purge_post(sender, instance, **kwargs):
+    invalidate_post_cards([instance.pk])
+    bump_versions('posts', 'feed', *post_cache_tags([instance]))
+    refresh_next_publication()
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, **kwargs):
+    index_posts([instance.pk])
+
+
+@receiver(post_save, sender=Post)
+def render_post_image(sender, instance, raw=False, **kwargs):
+    if not raw and instance.image and not has_renditions(instance.image.name):
+        schedule_renditions(instance.image.name, [instance.pk])
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    remove_posts([instance.pk])
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_facets(sender, instance, **kwargs):
+    instance._stored_facets = stored_facets(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def file_post_facets(sender, instance, **kwargs):
+    move_post(
+        instance.pk, getattr(instance, '_stored_facets', set()),
+        post_facets(instance)
+    )
+
+
+@receiver(post_delete, sender=Post)
+def unfile_post_facets(sender, instance, **kwargs):
+    update_facets(removed=[
+        (instance.pk, *pair) for pair in post_facets(instance)
+    ])
+
+
+@receiver(post_delete, sender=Category)
+def drop_category_facet(sender, instance, **kwargs):
+    drop_facet(PostFacet.CATEGORY, instance.pk)
+
+
+@receiver(post_delete, sender=Location)
+def drop_location_facet(sender, instance, **kwargs):
+    drop_facet(PostFacet.LOCATION, instance.pk)
+
+
+@receiver(post_published)
+def purge_published_post(sender, post, **kwargs):
+    bump_versions('posts', 'feed', *post_cache_tags([post]))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def purge_commented_post(sender, instance, **kwargs):
+    if instance.post_id:
+        invalidate_post_cards([instance.post_id])
+        bump_versions(f'post:{instance.post_id}')
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def purge_category(sender, instance, **kwargs):
+    bump_versions('posts', 'feed', f'category:{instance.pk}')
+    refresh_next_publication()
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def purge_location(sender, instance, **kwargs):
+    bump_versions(f'location:{instance.pk}')
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(pre_delete, sender=Location)
+def invalidate_related_post_cards(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_post_cards(instance.posts.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=User)
+def purge_author(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw and (update_fields is None or 'username' in update_fields):
+        invalidate_post_cards(instance.posts.values_list('pk', flat=True))
+        bump_versions('feed', f'author:{instance.pk}')
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_sitemap(sender, instance, **kwargs):
+    invalidate_shards('posts', [instance.pk])
+
+
+@receiver(post_published)
+def invalidate_published_post_sitemap(sender, post, **kwargs):
+    invalidate_shards('posts', [post.pk])
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_sitemap(sender, instance, **kwargs):
+    invalidate_shards('categories', [instance.pk])
+    invalidate_shards('posts')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_profile_sitemap(sender, instance, update_fields=None,
+                               **kwargs):
+    if update_fields is None or {'username', 'is_active'} & {*update_fields}:
+        invalidate_shards('profiles', [instance.pk])
@@ -0,0 +1,209 @@
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from wsgiref.util import FileWrapper
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Max
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.utils.text import slugify
+from django.views import View
+
+from blog.models import Category, Post, User
+
+SHARD_SIZE = 50000
+CHUNK_SIZE = 2000
+SITEMAP_NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+class Sitemap(ABC):
+    """A section of the sitemap split into shards by primary key range.
+
+    Shard ``n`` holds the objects with ids in ``(n * size, (n + 1) * size]``,
+    so a change to one object only invalidates the shard it falls into.
+    """
+
+    name = None
+    size = SHARD_SIZE
+
+    @abstractmethod
+    def get_queryset(self):
+        """Objects listed in the section."""
+
+    @abstractmethod
+    def get_rows(self, queryset):
+        """Yield ``(path, lastmod)`` pairs for the objects of a shard."""
+
+    def shard_count(self):
+        last = self.get_queryset().aggregate(last=Max('pk'))['last']
+        return 0 if last is None else (last - 1) // self.size + 1
+
+    def shard_of(self, pk):
+        return (pk - 1) // self.size
+
+    def items(self, shard):
+        queryset = self.get_queryset().filter(
+            pk__gt=shard * self.size, pk__lte=(shard + 1) * self.size
+        ).order_by('pk')
+        return self.get_rows(queryset)
+
+
+class PostSitemap(Sitemap):
+    name = 'posts'
+
+    def get_queryset(self):
+        return Post.objects.published()
+
+    def get_rows(self, queryset):
+        rows = queryset.values_list('pk', 'updated_at')
+        for pk, updated_at in rows.iterator(chunk_size=CHUNK_SIZE):
+            yield reverse('blog:post_detail', kwargs={'pk': pk}), updated_at
+
+
+class CategorySitemap(Sitemap):
+    name = 'categories'
+
+    def get_queryset(self):
+        return Category.objects.filter(is_published=True)
+
+    def get_rows(self, queryset):
+        rows = queryset.values_list('slug', 'updated_at')
+        for slug, updated_at in rows.iterator(chunk_size=CHUNK_SIZE):
+            yield reverse(
+                'blog:category_posts', kwargs={'slug': slug}
+            ), updated_at
+
+
+class ProfileSitemap(Sitemap):
+    name = 'profiles'
+
+    def get_queryset(self):
+        return User.objects.filter(is_active=True)
+
+    def get_rows(self, queryset):
+        rows = queryset.values_list(User.USERNAME_FIELD, flat=True)
+        for username in rows.iterator(chunk_size=CHUNK_SIZE):
+            yield reverse(
+                'blog:profile', kwargs={'username': username}
+            ), None
+
+
+SITEMAPS = {
+    sitemap.name: sitemap
+    for sitemap in (PostSitemap(), CategorySitemap(), ProfileSitemap())
+}
+
+
+def get_base_url():
+    """Canonical address of the site, used in every sitemap URL.
+
+    It comes from ``BLOG_SITEMAP_BASE_URL`` and never from the request:
+    the Host header is chosen by the client.
+    """
+    return settings.BLOG_SITEMAP_BASE_URL.rstrip('/')
+
+
+def shard_path(name, shard):
+    return (
+        Path(settings.BLOG_SITEMAP_ROOT) / slugify(get_base_url())
+        / f'{name}-{shard}.xml'
+    )
+
+
+def write_shard(name, shard):
+    """Stream one shard to disk, put it in place and return it open."""
+    base_url = get_base_url()
+    path = shard_path(name, shard)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sitemap = NamedTemporaryFile(
+        dir=path.parent, prefix=f'.{path.name}.', delete=False
+    )
+    sitemap.write((
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<urlset xmlns="{SITEMAP_NAMESPACE}">\n'
+    ).encode())
+    for location, lastmod in SITEMAPS[name].items(shard):
+        entry = f'<url><loc>{escape(base_url + location)}</loc>'
+        if lastmod is not None:
+            entry += f'<lastmod>{lastmod.date().isoformat()}</lastmod>'
+        sitemap.write(f'{entry}</url>\n'.encode())
+    sitemap.write(b'</urlset>\n')
+    sitemap.flush()
+    os.chmod(sitemap.name, 0o644)
+    os.replace(sitemap.name, path)
+    sitemap.seek(0)
+    return sitemap
+
+
+def open_shard(name, shard):
+    try:
+        return open(shard_path(name, shard), 'rb')
+    except FileNotFoundError:
+        return write_shard(name, shard)
+
+
+def invalidate_shards(name, pks=None):
+    """Drop cached shards of a section, all of them when ``pks`` is None."""
+    root = Path(settings.BLOG_SITEMAP_ROOT)
+    if pks is None:
+        paths = root.glob(f'*/{name}-*.xml')
+    else:
+        shards = {SITEMAPS[name].shard_of(pk) for pk in pks}
+        paths = [
+            path for shard in shards
+            for path in root.glob(f'*/{name}-{shard}.xml')
+        ]
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+class SitemapIndexView(View):
+
+    def get(self, request):
+        base_url = get_base_url()
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">',
+        ]
+        for name, sitemap in SITEMAPS.items():
+            for shard in range(sitemap.shard_count()):
+                location = reverse(
+                    'blog:sitemap_shard',
+                    kwargs={'section': name, 'shard': shard}
+                )
+                lines.append(
+                    f'<sitemap><loc>{escape(base_url + location)}</loc>'
+                    '</sitemap>'
+                )
+        lines.append('</sitemapindex>')
+        return HttpResponse(
+            '\n'.join(lines), content_type='application/xml'
+        )
+
+
+class SitemapShardView(View):
+
+    def get(self, request, section, shard):
+        sitemap = SITEMAPS.get(section)
+        if sitemap is None or shard >= sitemap.shard_count():
+            raise Http404
+        shard_file = open_shard(section, shard)
+        stat = os.fstat(shard_file.fileno())
+        last_modified = int(stat.st_mtime)
+        response = get_conditional_response(
+            request, last_modified=last_modified
+        )
+        if response is None:
+            response = StreamingHttpResponse(
+                FileWrapper(shard_file), content_type='application/xml'
+            )
+            response['Content-Length'] = stat.st_size
+        else:
+            shard_file.close()
+        response['Last-Modified'] = http_date(last_modified)
+        return response
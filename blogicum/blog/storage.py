@@ -0,0 +1,64 @@
+import hashlib
+import os
+import posixpath
+from tempfile import NamedTemporaryFile
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """File storage that names files by the SHA-256 of their content.
+
+    ``post_images/photo.jpg`` is stored as
+    ``post_images/ab/cd/abcd….jpg``, so uploading the same bytes again
+    reuses the stored file instead of writing a copy.
+    """
+
+    def hashed_name(self, name, content):
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        content.seek(0)
+        value = digest.hexdigest()
+        extension = posixpath.splitext(name)[1].lower()
+        return posixpath.join(
+            posixpath.dirname(name), value[:2], value[2:4], value + extension
+        )
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    @staticmethod
+    def is_stored(path, content):
+        """Tell if a complete copy of the content is already at the path.
+
+        Reusing a file refreshes its modification time, which keeps it
+        out of reach of collect_images for the grace period.
+        """
+        try:
+            return os.path.getsize(path) == content.size
+        except OSError:
+            return False
+
+    def _save(self, name, content):
+        name = self.hashed_name(name, content)
+        path = self.path(name)
+        if self.is_stored(path, content):
+            try:
+                os.utime(path)
+                return name
+            except FileNotFoundError:
+                pass
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        with NamedTemporaryFile(dir=directory, delete=False) as stored:
+            for chunk in content.chunks():
+                stored.write(chunk)
+        os.chmod(stored.name, self.file_permissions_mode or 0o644)
+        os.replace(stored.name, path)
+        return name
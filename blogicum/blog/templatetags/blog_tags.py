@@ -0,0 +1,37 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.safestring import mark_safe
+
+from blog.caching import HEADER_HOLE, render_post_cards
+from blog.renditions import get_manifest
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_cards(posts):
+    return [mark_safe(card) for card in render_post_cards(posts)]
+
+
+@register.simple_tag
+def header_hole():
+    return mark_safe(HEADER_HOLE)
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post, sizes='(max-width: 640px) 100vw, 640px'):
+    """Render the post image with its renditions when they are ready."""
+    manifest = get_manifest(post.image.name)
+    context = {'post': post, 'manifest': manifest, 'sizes': sizes}
+    if manifest is not None:
+        sources = manifest['sources']
+        context['webp_srcset'] = _srcset(sources['webp'])
+        context['jpeg_srcset'] = _srcset(sources['jpeg'])
+        context['src'] = default_storage.url(sources['jpeg'][-1][0])
+    return context
+
+
+def _srcset(sources):
+    return ', '.join(
+        f'{default_storage.url(name)} {width}w' for name, width in sources
+    )
@@ -1,6 +1,6 @@
 from django.urls import path, include
 
-from . import views
+from . import api, feeds, sitemaps, views
 
 app_name = 'blog'
 
@@ -19,6 +19,14 @@ post_urls = [
          views.PostDeleteView.as_view(),
          name='delete_post'
          ),
+    path('<int:pk>/personal/',
+         views.PostPersonalView.as_view(),
+         name='post_personal'
+         ),
+    path('<int:pk>/comments/',
+         views.CommentListView.as_view(),
+         name='comments'
+         ),
     path('<int:pk>/comment/',
          views.CommentCreateView.as_view(),
          name='add_comment'
@@ -40,16 +48,52 @@ profile_urls = [
     path('<str:username>/',
          views.ProfileDetailView.as_view(),
          name='profile'),
+    path('<str:username>/cards/',
+         views.ProfileCardsView.as_view(),
+         name='profile_cards'),
+    path('<str:username>/feed/<str:feed_format>/',
+         feeds.ProfileFeedView.as_view(),
+         name='profile_feed'),
 ]
 
 category_urls = [
     path('<slug:slug>/',
          views.CategoryDetailView.as_view(), name='category_posts'),
+    path('<slug:slug>/cards/',
+         views.CategoryCardsView.as_view(), name='category_cards'),
+    path('<slug:slug>/feed/<str:feed_format>/',
+         feeds.CategoryFeedView.as_view(), name='category_feed'),
+]
+
+api_urls = [
+    path('posts/', api.FeedApiView.as_view(), name='api_feed'),
+    path('posts/<int:pk>/', api.PostApiView.as_view(), name='api_post'),
+    path('posts/<int:pk>/comments/',
+         api.CommentsApiView.as_view(),
+         name='api_comments'),
+    path('categories/<slug:slug>/posts/',
+         api.CategoryFeedApiView.as_view(),
+         name='api_category_feed'),
+    path('authors/<str:username>/posts/',
+         api.AuthorFeedApiView.as_view(),
+         name='api_author_feed'),
 ]
 
 urlpatterns = [
     path('', views.PostListView.as_view(), name='index'),
+    path('cards/', views.FeedCardsView.as_view(), name='index_cards'),
+    path('feed/<str:feed_format>/',
+         feeds.PostFeedView.as_view(),
+         name='index_feed'),
+    path('sitemap.xml',
+         sitemaps.SitemapIndexView.as_view(),
+         name='sitemap'),
+    path('sitemap-<str:section>-<int:shard>.xml',
+         sitemaps.SitemapShardView.as_view(),
+         name='sitemap_shard'),
+    path('search/', views.PostSearchView.as_view(), name='search'),
     path('posts/', include(post_urls)),
+    path('api/', include(api_urls)),
     path('profile/', include(profile_urls)),
     path('category/', include(category_urls)),
 ]
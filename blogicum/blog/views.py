@@ -1,31 +1,259 @@
-import datetime
+import time
+from functools import update_wrapper
+from http import HTTPStatus
 
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
-from django.http import Http404
+from django.db import transaction
+from django.db.models import BooleanField, Case, When
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect
+from django.template.loader import render_to_string
 from django.urls import reverse_lazy, reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe, urlencode
+from django.utils.safestring import mark_safe
+from django.views import View
 from django.views.generic.edit import FormMixin
 from django.views.generic import (
     CreateView, DetailView, ListView, UpdateView, DeleteView
 )
 
+from blog.caching import (
+    BULK_TAG, HEADER_HOLE, comment_cache_tags, fill_holes, get_cached_page,
+    is_page_cacheable, page_validators, personal_etag, post_cache_tags,
+    read_versions, render_fragment, render_post_cards, store_page
+)
 from blog.forms import PostForm, CommentForm, ProfileUpdateForm
-from blog.models import Post, Comment, Category, User
+from blog.models import Post, Comment, Category, Location, User
+from blog.paginators import (
+    FORWARD, FeedPaginator, InvalidCursor, KeysetPaginator
+)
+from blog.scheduler import publish_due_posts, scheduled_timeout
+from blog.search import SearchPaginator
 
 POSTS_PER_PAGE = 10
+COMMENTS_PER_PAGE = 20
+COMMENT_ORDERING = ('created_at', 'id')
+
+
+class FeedPaginationMixin:
+    paginator_class = FeedPaginator
+    cursor_kwarg = 'cursor'
+    keyset_ordering = ('-pub_date', '-id')
+    cards_url_name = None
+
+    def get_count_cache_key(self):
+        return None
+
+    def get_paginator(self, *args, **kwargs):
+        return super().get_paginator(
+            *args, count_cache_key=self.get_count_cache_key(), **kwargs
+        )
+
+    def use_keyset_pagination(self):
+        return (
+            settings.BLOG_KEYSET_PAGINATION
+            or self.cursor_kwarg in self.request.GET
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_keyset_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = KeysetPaginator(queryset, page_size, self.keyset_ordering)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor as error:
+            raise Http404(str(error))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_cards_url(self, page):
+        """URL of the post cards that follow the page, for infinite scroll."""
+        if self.cards_url_name is None or not page.has_next():
+            return None
+        cursor = KeysetPaginator(
+            None, 0, self.keyset_ordering
+        ).encode_cursor(FORWARD, page[-1])
+        return '{}?{}'.format(
+            reverse(self.cards_url_name, kwargs=self.kwargs),
+            urlencode({self.cursor_kwarg: cursor})
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['cards_url'] = self.get_cards_url(context['page_obj'])
+        return context
 
 
-class ProfileDetailView(ListView):
+class OwnedObjectMixin:
+    """Fetch the object once per request, flagging its owner in SQL.
+
+    ``is_owner`` is computed by the lookup query itself and the object
+    is reused by ``dispatch`` and the generic view handlers.
+    """
+
+    owner_field = 'author'
+
+    def get_queryset(self):
+        return super().get_queryset().annotate(is_owner=Case(
+            When(**{self.owner_field: self.request.user.pk}, then=True),
+            default=False,
+            output_field=BooleanField()
+        ))
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
+
+class ConditionalGetMixin:
+
+    def get_page_posts(self, context):
+        return context['page_obj']
+
+    def get_page_cache_tags(self, context):
+        return {BULK_TAG, *post_cache_tags(self.get_page_posts(context))}
+
+    def get_validator_parts(self):
+        user = self.request.user
+        return user.pk, user.get_username(), self.request.get_full_path()
+
+    def personalize_etag(self, etag):
+        return etag
+
+    def render_to_response(self, context, **response_kwargs):
+        self.page_tags = self.get_page_cache_tags(context)
+        versions, created = read_versions(self.page_tags)
+        self.created_tags = {*getattr(self, 'created_tags', ()), *created}
+        self.page_etag, last_modified = page_validators(
+            self.get_page_posts(context), versions,
+            *self.get_validator_parts()
+        )
+        etag = self.personalize_etag(self.page_etag)
+        response = get_conditional_response(
+            self.request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = super().render_to_response(context, **response_kwargs)
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class PageCacheMixin(ConditionalGetMixin):
+    """Cache rendered pages, shared across users where they allow it.
+
+    Pages that differ between users only in the site header are rendered
+    as shells with a hole instead of the header. One cached shell then
+    serves everybody: the header of the current user is spliced in at
+    response time and the ETag is made per user.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+
+        def cached_view(request, *args, **kwargs):
+            publish_due_posts()
+            if is_page_cacheable(request, cls.shares_pages()):
+                response = get_cached_page(request)
+                if response is not None and (
+                    response.is_shell or not request.user.is_authenticated
+                ):
+                    etag = response.get('ETag')
+                    if response.is_shell and (
+                        HEADER_HOLE.encode() in response.content
+                    ):
+                        fill_holes(request, response)
+                        if etag is not None:
+                            etag = personal_etag(etag, request)
+                            response['ETag'] = etag
+                    return get_conditional_response(
+                        request,
+                        etag=etag,
+                        last_modified=parse_http_date_safe(
+                            response.get('Last-Modified')
+                        ),
+                        response=response
+                    )
+            return view(request, *args, **kwargs)
+
+        return update_wrapper(cached_view, view)
+
+    @classmethod
+    def shares_pages(cls):
+        return settings.BLOG_PAGE_SHELL
+
+    def is_public_page(self):
+        return True
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        self.page_cache_started = time.time_ns()
+
+    def get_page_cache_timeout(self):
+        return scheduled_timeout(settings.BLOG_PAGE_CACHE_TIMEOUT)
+
+    def get_validator_parts(self):
+        if self.shares_pages():
+            return (self.request.get_full_path(),)
+        return super().get_validator_parts()
+
+    def personalize_etag(self, etag):
+        if self.shares_pages():
+            return personal_etag(etag, self.request)
+        return etag
+
+    def render_to_response(self, context, **response_kwargs):
+        shell = self.shares_pages()
+        context['page_shell'] = shell
+        response = super().render_to_response(context, **response_kwargs)
+        if response.status_code != HTTPStatus.OK:
+            return response
+        if is_page_cacheable(self.request, shell) and (
+            self.is_public_page() or not self.request.user.is_authenticated
+        ):
+            timeout = self.get_page_cache_timeout()
+            response.add_post_render_callback(
+                lambda response: store_page(
+                    self.request, response, self.page_tags,
+                    self.page_cache_started, timeout,
+                    etag=self.page_etag, shell=shell,
+                    created=self.created_tags
+                )
+            )
+        if shell:
+            response.add_post_render_callback(
+                lambda response: fill_holes(self.request, response)
+            )
+        return response
+
+
+class ProfileDetailView(ConditionalGetMixin, FeedPaginationMixin, ListView):
     model = Post
     template_name = 'blog/profile.html'
+    cards_url_name = 'blog:profile_cards'
     paginate_by = POSTS_PER_PAGE
 
     def get_queryset(self):
         self.author = get_object_or_404(User, username=self.kwargs['username'])
-        return Post.objects.filter(
-            author=self.author,
-        ).order_by('-pub_date').annotate(comment_count=Count('comments'))
+        self.include_hidden = self.request.user == self.author
+        return Post.objects.for_author(
+            self.author, include_hidden=self.include_hidden
+        )
+
+    def get_count_cache_key(self):
+        return f'profile:{self.author.pk}:{self.include_hidden:d}'
+
+    def get_page_cache_tags(self, context):
+        return {
+            f'author:{self.author.pk}',
+            *super().get_page_cache_tags(context)
+        }
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -64,14 +292,16 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         )
 
 
-class PostUpdateView(LoginRequiredMixin, UpdateView):
+class PostUpdateView(LoginRequiredMixin, OwnedObjectMixin, UpdateView):
     model = Post
     form_class = PostForm
     template_name = 'blog/create.html'
 
+    def get_queryset(self):
+        return super().get_queryset().with_related()
+
     def dispatch(self, request, *args, **kwargs):
-        post_object = self.get_object()
-        if post_object.author != request.user:
+        if not self.get_object().is_owner:
             return redirect('blog:post_detail', pk=kwargs['pk'])
         return super().dispatch(request, *args, **kwargs)
 
@@ -82,55 +312,367 @@ class PostUpdateView(LoginRequiredMixin, UpdateView):
         )
 
 
-class PostDeleteView(LoginRequiredMixin, DeleteView):
+class PostDeleteView(LoginRequiredMixin, OwnedObjectMixin, DeleteView):
     model = Post
     form = PostForm
     template_name = 'blog/create.html'
     success_url = reverse_lazy('blog:index')
 
+    def get_queryset(self):
+        return super().get_queryset().with_related()
+
     def dispatch(self, request, *args, **kwargs):
-        post_object = self.get_object()
-        if post_object.author != request.user:
+        if not self.get_object().is_owner:
             return redirect('blog:post_detail', pk=kwargs['pk'])
         return super().dispatch(request, *args, **kwargs)
 
 
-class PostListView(ListView):
+class PostListView(PageCacheMixin, FeedPaginationMixin, ListView):
     model = Post
     template_name = 'blog/index.html'
+    cards_url_name = 'blog:index_cards'
     paginate_by = POSTS_PER_PAGE
 
-    def get_queryset(self, **kwargs):
-        qs = super().get_queryset(**kwargs)
-        return qs.filter(
-            is_published=True,
-            category__is_published=True,
-            pub_date__lte=datetime.datetime.now()
-        ).order_by('-pub_date').annotate(comment_count=Count('comments'))
+    def get_queryset(self):
+        return Post.objects.published_feed()
+
+    def get_count_cache_key(self):
+        return 'index'
 
+    def get_page_cache_tags(self, context):
+        return {'feed', *super().get_page_cache_tags(context)}
 
-class PostDetailView(DetailView, FormMixin):
+
+class PostCardsView(PageCacheMixin, ListView):
+    """Post cards after a cursor, without the page around them.
+
+    Infinite scroll appends these fragments to a feed. They hold at most
+    ``BLOG_CARDS_MAX_POSTS`` cards and stop early once
+    ``BLOG_CARDS_MAX_BYTES`` of markup is reached, so every response fits
+    a CDN object; the next fragment continues where this one stopped.
+    """
+
+    template_name = 'includes/post_cards.html'
+    cursor_kwarg = 'cursor'
+    ordering = ('-pub_date', '-id')
+
+    @classmethod
+    def shares_pages(cls):
+        return True
+
+    def personalize_etag(self, etag):
+        return etag
+
+    def get_paginate_by(self, queryset):
+        try:
+            limit = int(self.request.GET.get('limit', POSTS_PER_PAGE))
+        except ValueError:
+            raise Http404('Параметр limit должен быть числом.')
+        return max(1, min(limit, settings.BLOG_CARDS_MAX_POSTS))
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(queryset, page_size, self.ordering)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor as error:
+            raise Http404(str(error))
+        return paginator, page, page.object_list, page.has_next()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context['page_obj']
+        cards, size = [], 0
+        for card in render_post_cards(page):
+            size += len(card.encode())
+            if cards and size > settings.BLOG_CARDS_MAX_BYTES:
+                break
+            cards.append(mark_safe(card))
+        cursor = page.next_cursor
+        if len(cards) < len(page):
+            cursor = context['paginator'].encode_cursor(
+                FORWARD, page[len(cards) - 1]
+            )
+        context['cards'] = cards
+        context['next_url'] = self.get_next_url(cursor)
+        return context
+
+    def get_next_url(self, cursor):
+        if cursor is None:
+            return None
+        params = self.request.GET.copy()
+        params[self.cursor_kwarg] = cursor
+        return f'{self.request.path}?{params.urlencode()}'
+
+    def render_to_response(self, context, **response_kwargs):
+        response = super().render_to_response(context, **response_kwargs)
+        if context['next_url'] is not None:
+            response['Link'] = f'<{context["next_url"]}>; rel="next"'
+        if self.shares_pages():
+            patch_cache_control(
+                response, public=True,
+                max_age=settings.BLOG_CARDS_MAX_AGE
+            )
+        else:
+            patch_cache_control(response, private=True)
+        return response
+
+
+class FeedCardsView(PostCardsView):
+
+    def get_queryset(self):
+        return Post.objects.published_feed()
+
+    def get_page_cache_tags(self, context):
+        return {'feed', *super().get_page_cache_tags(context)}
+
+
+class CategoryCardsView(PostCardsView):
+
+    def get_queryset(self):
+        self.category = get_object_or_404(
+            Category, slug=self.kwargs['slug'], is_published=True
+        )
+        return Post.objects.for_category(self.category)
+
+    def get_page_cache_tags(self, context):
+        return {
+            f'category:{self.category.pk}',
+            *super().get_page_cache_tags(context)
+        }
+
+
+class ProfileCardsView(PostCardsView):
+    """Cards of an author's posts; hidden ones are included for the author.
+
+    Because of that the fragment depends on the user and is only shared
+    between anonymous visitors.
+    """
+
+    @classmethod
+    def shares_pages(cls):
+        return False
+
+    def is_public_page(self):
+        return not self.include_hidden
+
+    def get_queryset(self):
+        self.author = get_object_or_404(User, username=self.kwargs['username'])
+        self.include_hidden = self.request.user == self.author
+        return Post.objects.for_author(
+            self.author, include_hidden=self.include_hidden
+        )
+
+    def get_page_cache_tags(self, context):
+        return {
+            f'author:{self.author.pk}',
+            *super().get_page_cache_tags(context)
+        }
+
+
+class PostSearchView(ListView):
+    model = Post
+    template_name = 'blog/search.html'
+    paginate_by = POSTS_PER_PAGE
+    cursor_kwarg = 'cursor'
+
+    def get_queryset(self):
+        publish_due_posts()
+        self.query = self.request.GET.get('q', '').strip()
+        self.category = self.get_facet_value(
+            Category, 'category', 'slug'
+        )
+        self.location = self.get_facet_value(Location, 'location', 'pk')
+        return Post.objects.published_feed()
+
+    def get_facet_value(self, model, name, field):
+        value = self.request.GET.get(name)
+        if not value:
+            return None
+        try:
+            return model.objects.get(**{field: value, 'is_published': True})
+        except (model.DoesNotExist, ValueError):
+            raise Http404
+
+    def get_filters(self):
+        return {
+            'category_id': self.category and self.category.pk,
+            'location_id': self.location and self.location.pk,
+        }
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = SearchPaginator(
+            queryset, self.query, page_size, **self.get_filters()
+        )
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor as error:
+            raise Http404(str(error))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_facets(self, paginator):
+        categories, locations = paginator.facet_counts
+        return {
+            'categories': self._facet_items(Category, categories),
+            'locations': self._facet_items(Location, locations),
+        }
+
+    @staticmethod
+    def _facet_items(model, counts):
+        objects = model.objects.filter(pk__in=counts, is_published=True)
+        return sorted(
+            ((item, counts[item.pk]) for item in objects),
+            key=lambda facet: (-facet[1], str(facet[0]))
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        params = self.request.GET.copy()
+        params.pop(self.cursor_kwarg, None)
+        context.update(
+            query=self.query,
+            search_params=params.urlencode(),
+            category=self.category,
+            location=self.location,
+            facets=(
+                self.get_facets(context['paginator'])
+                if self.query else None
+            ),
+        )
+        return context
+
+
+class PostDetailView(PageCacheMixin, DetailView, FormMixin):
     model = Post
     template_name = 'blog/detail.html'
     form_class = CommentForm
 
-    def dispatch(self, request, *args, **kwargs):
-        post_object = self.get_object()
-        if not post_object.is_published and post_object.author != request.user:
-            raise Http404
-        return super().dispatch(request, *args, **kwargs)
+    @classmethod
+    def shares_pages(cls):
+        return (
+            settings.BLOG_PAGE_SHELL and settings.BLOG_DEFERRED_POST_DETAIL
+        )
+
+    def is_public_page(self):
+        return self.object.is_published
+
+    def get_queryset(self):
+        return Post.objects.with_related().visible_to(self.request.user)
+
+    def get_page_posts(self, context):
+        return [self.object]
+
+    def get_page_cache_tags(self, context):
+        tags = super().get_page_cache_tags(context)
+        if 'comments' in context:
+            tags |= comment_cache_tags(context['comments'])
+        return tags | getattr(self, 'fragment_tags', set())
+
+    def get_comments(self):
+        return KeysetPaginator(
+            self.object.comments.select_related('author'),
+            COMMENTS_PER_PAGE, COMMENT_ORDERING
+        ).page(None)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['comments'] = (
-            self.object.comments.select_related('author')
+        if not settings.BLOG_DEFERRED_POST_DETAIL:
+            context['comments'] = self.get_comments()
+            return context
+        context['deferred'] = True
+        post_detail, self.fragment_tags, self.created_tags = render_fragment(
+            f'post_detail:{self.object.pk}',
+            {BULK_TAG, *post_cache_tags([self.object])},
+            'includes/post_detail.html',
+            lambda: {
+                'post': self.object,
+                'comments': self.get_comments(),
+                'deferred': True,
+            },
+            lambda context: comment_cache_tags(context['comments'])
         )
+        context['post_detail'] = mark_safe(post_detail)
         return context
 
 
-class CategoryDetailView(ListView):
+class PostPersonalView(View):
+    """Per-user parts of a post page whose shared HTML is cached.
+
+    Returns the comment form with its CSRF token and the author's post
+    buttons; the page script fills its holes from them.
+    """
+
+    def get(self, request, pk):
+        post = get_object_or_404(
+            Post.objects.visible_to(request.user), pk=pk
+        )
+        context = {'post': post, 'form': CommentForm()}
+        personal = {
+            'user_id': request.user.pk,
+            'post_actions': '',
+            'comment_form': '',
+        }
+        if request.user.is_authenticated:
+            personal['comment_form'] = render_to_string(
+                'includes/comment_form.html', context, request
+            )
+        if post.author_id == request.user.pk:
+            personal['post_actions'] = render_to_string(
+                'includes/post_actions.html', context, request
+            )
+        response = JsonResponse(personal)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class CommentListView(PageCacheMixin, ListView):
+    """Next page of a post's comments, rendered as an HTML fragment."""
+
+    template_name = 'includes/comment_list.html'
+    paginate_by = COMMENTS_PER_PAGE
+    context_object_name = 'comments'
+
+    def get_queryset(self):
+        self.post_object = get_object_or_404(
+            Post.objects.with_related().visible_to(self.request.user),
+            pk=self.kwargs['pk']
+        )
+        return self.post_object.comments.select_related('author')
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(queryset, page_size, COMMENT_ORDERING)
+        try:
+            page = paginator.page(self.request.GET.get('cursor'))
+        except InvalidCursor as error:
+            raise Http404(str(error))
+        return paginator, page, page, page.has_other_pages()
+
+    @classmethod
+    def shares_pages(cls):
+        return settings.BLOG_DEFERRED_POST_DETAIL
+
+    def is_public_page(self):
+        return self.post_object.is_published
+
+    def get_page_posts(self, context):
+        return [self.post_object]
+
+    def get_page_cache_tags(self, context):
+        return {
+            *super().get_page_cache_tags(context),
+            *comment_cache_tags(context['comments'])
+        }
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['post'] = self.post_object
+        context['deferred'] = settings.BLOG_DEFERRED_POST_DETAIL
+        return context
+
+
+class CategoryDetailView(PageCacheMixin, FeedPaginationMixin, ListView):
     model = Post
     template_name = 'blog/category.html'
+    cards_url_name = 'blog:category_cards'
     paginate_by = POSTS_PER_PAGE
 
     def dispatch(self, request, *args, **kwargs):
@@ -140,12 +682,16 @@ class CategoryDetailView(ListView):
         return super().dispatch(request, *args, **kwargs)
 
     def get_queryset(self):
-        return Post.objects.filter(
-            category=self.category,
-            is_published=True,
-            category__is_published=True,
-            pub_date__lte=datetime.datetime.now()
-        ).order_by('-pub_date').annotate(comment_count=Count('comments'))
+        return Post.objects.for_category(self.category)
+
+    def get_count_cache_key(self):
+        return f'category:{self.category.pk}'
+
+    def get_page_cache_tags(self, context):
+        return {
+            f'category:{self.category.pk}',
+            *super().get_page_cache_tags(context)
+        }
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -161,6 +707,7 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
         self.post_object = get_object_or_404(Post, pk=kwargs['pk'])
         return super().dispatch(request, *args, **kwargs)
 
+    @transaction.atomic
     def form_valid(self, form):
         form.instance.author = self.request.user
         form.instance.post = self.post_object
@@ -170,25 +717,24 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
         return reverse('blog:post_detail', kwargs={'pk': self.post_object.pk})
 
 
-class CommentMixin():
+class CommentMixin(OwnedObjectMixin):
     model = Comment
     form_class = CommentForm
     pk_url_kwarg = 'comment_id'
     template_name = 'blog/comment.html'
 
+    def get_queryset(self):
+        return super().get_queryset().filter(post_id=self.kwargs['post_id'])
+
     def dispatch(self, request, *args, **kwargs):
-        self.post_object = get_object_or_404(Post, pk=kwargs['post_id'])
-        comment_object = get_object_or_404(
-            Comment,
-            post=self.post_object,
-            id=self.kwargs['comment_id']
-        )
-        if comment_object.author != request.user:
+        if not self.get_object().is_owner:
             return redirect('blog:post_detail', pk=kwargs['post_id'])
         return super().dispatch(request, *args, **kwargs)
 
     def get_success_url(self):
-        return reverse('blog:post_detail', kwargs={'pk': self.post_object.pk})
+        return reverse(
+            'blog:post_detail', kwargs={'pk': self.kwargs['post_id']}
+        )
 
 
 class CommentUpdateView(LoginRequiredMixin, CommentMixin, UpdateView):
@@ -196,4 +742,7 @@ class CommentUpdateView(LoginRequiredMixin, CommentMixin, UpdateView):
 
 
 class CommentDeleteView(LoginRequiredMixin, CommentMixin, DeleteView):
-    pass
+
+    @transaction.atomic
+    def delete(self, request, *args, **kwargs):
+        return super().delete(request, *args, **kwargs)
@@ -60,6 +60,12 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -99,4 +105,24 @@ EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 LOGIN_URL = '/auth/login/'
 LOGIN_REDIRECT_URL = 'blog:index'
 MEDIA_ROOT = BASE_DIR / 'media'
+FILE_UPLOAD_MAX_MEMORY_SIZE = 256 * 1024
 CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
+
+BLOG_KEYSET_PAGINATION = False
+BLOG_PAGINATOR_COUNT_TIMEOUT = 60
+BLOG_POST_CARD_TIMEOUT = 60 * 60
+BLOG_PAGE_CACHE_TIMEOUT = 60 * 5
+BLOG_DEFERRED_POST_DETAIL = False
+BLOG_PAGE_SHELL = False
+BLOG_CARDS_MAX_POSTS = 50
+BLOG_CARDS_MAX_BYTES = 256 * 1024
+BLOG_CARDS_MAX_AGE = 60
+BLOG_FEED_LENGTH = 50
+BLOG_SITEMAP_ROOT = BASE_DIR / 'sitemaps'
+BLOG_SITEMAP_BASE_URL = 'http://127.0.0.1:8000'
+BLOG_IMAGE_WIDTHS = (320, 640, 1280)
+BLOG_IMAGE_WORKERS = 2
+BLOG_IMAGE_MAX_BYTES = 10 * 2 ** 20
+BLOG_IMAGE_MAX_PIXELS = 30 * 10 ** 6
+BLOG_IMAGE_GC_GRACE = 24 * 60 * 60
+BLOG_IMAGE_GC_INTERVAL = 60 * 60
@@ -16,3 +16,14 @@ class PublishedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class TimestampedModel(PublishedModel):
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено'
+    )
+
+    class Meta:
+        abstract = True
@@ -19,11 +19,13 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
 from django.test import override_settings
 from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
 from mixer.backend.django import mixer as _mixer
 
 N_PER_FIXTURE = 3
@@ -133,6 +135,13 @@ def another_user_client(another_user):
     return client
 
 
+@pytest.fixture
+def own_comment(mixer, user, post_with_published_location):
+    return mixer.blend(
+        "blog.Comment", author=user, post=post_with_published_location
+    )
+
+
 def get_post_list_context_key(
         user_client, page_url, page_load_err_msg, key_missing_msg
 ):
@@ -257,6 +266,16 @@ def get_get_response_safely(
     return response
 
 
+def get_response_queries(
+        client: Client, url: str, **headers
+) -> Tuple[HttpResponse, List[str]]:
+    """Return the response to a GET request together with the SQL
+    of every query executed while serving it."""
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(url, **headers)
+    return response, [query["sql"] for query in captured.captured_queries]
+
+
 def get_a_post_get_response_safely(
         user_client: Client, post_id: Union[str, int]
 ) -> HttpResponse:
@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_api_feed_paginates_with_cursor(
+        client, many_posts_with_published_locations):
+    first = client.get('/api/posts/', {'limit': 5}).json()
+    assert len(first['results']) == 5
+    assert first['previous'] is None and first['next']
+    second = client.get(first['next']).json()
+    ids = [post['id'] for post in first['results'] + second['results']]
+    assert len(set(ids)) == 10, (
+        "Убедитесь, что курсор API продолжает выдачу без повторов."
+    )
+    assert 'text' not in first['results'][0]
+
+
+def test_api_fields_are_selected_in_sql(client,
+                                        post_with_published_location):
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get('/api/posts/', {'fields': 'id,title'})
+    assert response.json()['results'] == [{
+        'id': post_with_published_location.pk,
+        'title': post_with_published_location.title,
+    }]
+    sql = captured.captured_queries[-1]['sql']
+    assert '"blog_post"."excerpt"' not in sql, (
+        "Убедитесь, что параметр fields ограничивает выбираемые столбцы."
+    )
+    assert client.get(
+        '/api/posts/', {'fields': 'password'}
+    ).status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_api_post_detail_and_comments(
+        client, comment_to_a_post, mixer, published_category):
+    post = comment_to_a_post.post
+    detail = client.get(f'/api/posts/{post.pk}/').json()
+    assert detail['text'] == post.text
+    assert detail['author'] == post.author.username
+    comments = client.get(f'/api/posts/{post.pk}/comments/').json()
+    assert [item['id'] for item in comments['results']] == [
+        comment_to_a_post.pk
+    ]
+    hidden = mixer.blend(
+        'blog.Post', category=published_category, is_published=False
+    )
+    for url in (f'/api/posts/{hidden.pk}/',
+                f'/api/posts/{hidden.pk}/comments/'):
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_api_category_and_author_feeds(client,
+                                       post_with_published_location):
+    post = post_with_published_location
+    for url in (f'/api/categories/{post.category.slug}/posts/',
+                f'/api/authors/{post.author.username}/posts/'):
+        results = client.get(url, {'fields': 'id'}).json()['results']
+        assert results == [{'id': post.pk}]
@@ -0,0 +1,60 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(
+        mixer, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend('blog.Comment', post=post)
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что при создании комментария счётчик комментариев "
+        "публикации увеличивается."
+    )
+    comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что при удалении комментария счётчик комментариев "
+        "публикации уменьшается."
+    )
+
+
+def test_recount_comments_command(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    type(post).objects.filter(pk=post.pk).update(comment_count=7)
+    call_command('recount_comments', stdout=StringIO())
+    post.refresh_from_db()
+    assert post.comment_count == 2
+
+
+def test_feed_does_not_aggregate_comments(
+        user_client, post_with_published_location):
+    with CaptureQueriesContext(connection) as captured:
+        user_client.get('/')
+    assert not any(
+        'GROUP BY' in query['sql'] for query in captured.captured_queries
+    ), "Убедитесь, что лента читает сохранённое количество комментариев."
+
+
+def test_admin_cannot_move_comment(admin_client, mixer,
+                                   post_with_published_location,
+                                   post_of_another_author):
+    comment = mixer.blend('blog.Comment', post=post_with_published_location)
+    admin_client.post(f'/admin/blog/comment/{comment.pk}/change/', {
+        'text': comment.text,
+        'author': comment.author_id,
+        'post': post_of_another_author.pk,
+        'is_published': 'on',
+    })
+    comment.refresh_from_db()
+    assert comment.post == post_with_published_location, (
+        "Убедитесь, что в админке нельзя перенести комментарий к другой "
+        "публикации: счётчики комментариев разойдутся."
+    )
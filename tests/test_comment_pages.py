@@ -0,0 +1,69 @@
+import re
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def many_comments(user, post_with_published_location):
+    now = timezone.now()
+    Comment.objects.bulk_create(
+        Comment(
+            post=post_with_published_location, author=user,
+            text=f'Комментарий {number}',
+        )
+        for number in range(25)
+    )
+    for number, pk in enumerate(
+        Comment.objects.order_by('id').values_list('pk', flat=True)
+    ):
+        Comment.objects.filter(pk=pk).update(
+            created_at=now + timedelta(minutes=number % 3)
+        )
+
+
+def _texts(content):
+    return re.findall(r'Комментарий \d+', content)
+
+
+def test_detail_renders_first_page(client, post_with_published_location,
+                                   many_comments):
+    post = post_with_published_location
+    content = client.get(f'/posts/{post.pk}/').content.decode()
+    first_page = _texts(content)
+    assert len(first_page) == 20, (
+        'Убедитесь, что на странице публикации выводится только первая '
+        'страница комментариев.'
+    )
+    more = re.search(r'href="(/posts/\d+/comments/\?cursor=[^"]+)"', content)
+    assert more, 'Убедитесь, что есть ссылка на следующие комментарии.'
+    response = client.get(more.group(1).replace('&amp;', '&'))
+    assert response.status_code == HTTPStatus.OK
+    rest = _texts(response.content.decode())
+    assert len(rest) == 5 and not set(rest) & set(first_page)
+    assert 'data-comments-more' not in response.content.decode()
+    expected = [
+        comment.text for comment in Comment.objects.order_by(
+            'created_at', 'id'
+        )
+    ]
+    assert first_page + rest == expected
+
+
+def test_fragment_respects_visibility(another_user_client,
+                                      post_with_published_location):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    assert another_user_client.get(
+        f'/posts/{post.pk}/comments/'
+    ).status_code == HTTPStatus.NOT_FOUND
+    assert another_user_client.get(
+        f'/posts/{post.pk}/comments/?cursor=broken'
+    ).status_code == HTTPStatus.NOT_FOUND
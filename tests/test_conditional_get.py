@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def urls(post_with_published_location):
+    post = post_with_published_location
+    return [
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{post.author.username}/',
+        f'/posts/{post.id}/',
+    ]
+
+
+def _revalidate(client, url, response):
+    return client.get(
+        url,
+        HTTP_IF_NONE_MATCH=response['ETag'],
+        HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+    )
+
+
+@pytest.mark.parametrize('client_name', ['client', 'user_client'])
+def test_unchanged_page_is_not_modified(request, urls, client_name):
+    client = request.getfixturevalue(client_name)
+    for url in urls:
+        response = client.get(url)
+        assert response.has_header('ETag')
+        assert response.has_header('Last-Modified')
+        assert _revalidate(client, url, response).status_code == (
+            HTTPStatus.NOT_MODIFIED
+        ), f"Убедитесь, что страница `{url}` поддерживает условные запросы."
+
+
+@pytest.mark.parametrize('change', ['post', 'comment', 'location'])
+def test_changed_page_is_sent_again(
+        mixer, client, urls, post_with_published_location, change):
+    post = post_with_published_location
+    if change == 'comment':
+        urls = urls[-1:]
+    responses = {url: client.get(url) for url in urls}
+    if change == 'comment':
+        mixer.blend('blog.Comment', post=post)
+    else:
+        {'post': post, 'location': post.location}[change].save()
+    for url, response in responses.items():
+        assert _revalidate(client, url, response).status_code == (
+            HTTPStatus.OK
+        ), (
+            f"Убедитесь, что страница `{url}` отдаётся заново "
+            f"после изменения: {change}."
+        )
+
+
+def test_validators_depend_on_user(client, user_client, urls):
+    url = urls[-1]
+    response = client.get(url)
+    assert _revalidate(user_client, url, response).status_code == (
+        HTTPStatus.OK
+    ), "Убедитесь, что ETag страницы зависит от пользователя."
@@ -0,0 +1,81 @@
+from http import HTTPStatus
+
+import pytest
+
+from conftest import get_response_queries
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def deferred(settings):
+    settings.BLOG_DEFERRED_POST_DETAIL = True
+
+
+def test_detail_has_no_personal_parts(user_client, another_user_client,
+                                      own_comment):
+    url = f'/posts/{own_comment.post_id}/'
+    for client in (user_client, another_user_client):
+        content = client.get(url).content.decode()
+        assert 'csrfmiddlewaretoken' not in content, (
+            'Убедитесь, что в общей части страницы публикации нет '
+            'CSRF-токена.'
+        )
+        assert 'data-hole="comment_form"' in content
+        assert f'data-comment-author="{own_comment.author_id}"' in content
+
+
+def test_post_body_rendered_once(user_client, another_user_client,
+                                 own_comment):
+    url = f'/posts/{own_comment.post_id}/'
+    user_client.get(url)
+    _, queries = get_response_queries(another_user_client, url)
+    assert not any(
+        'FROM "blog_comment"' in sql for sql in queries
+    ), 'Убедитесь, что тело публикации с комментариями кешируется.'
+    own_comment.text = 'Новый текст'
+    own_comment.save()
+    assert 'Новый текст' in another_user_client.get(url).content.decode()
+
+
+def test_personal_endpoint(user_client, another_user_client,
+                           unlogged_client, own_comment):
+    url = f'/posts/{own_comment.post_id}/personal/'
+    personal = user_client.get(url).json()
+    assert personal['user_id'] == own_comment.author_id
+    assert 'csrfmiddlewaretoken' in personal['comment_form']
+    assert 'edit/' in personal['post_actions']
+    response = another_user_client.get(url)
+    assert 'private' in response['Cache-Control']
+    assert response.json()['post_actions'] == ''
+    assert unlogged_client.get(url).json() == {
+        'user_id': None, 'post_actions': '', 'comment_form': '',
+    }
+
+
+def test_personal_endpoint_hides_unpublished(another_user_client,
+                                             post_with_published_location):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    assert another_user_client.get(
+        f'/posts/{post.pk}/personal/'
+    ).status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.parametrize('url', ['/posts/{pk}/', '/posts/{pk}/comments/'])
+def test_commenter_rename_purges_comments(client, mixer, another_user,
+                                          post_with_published_location,
+                                          url):
+    url = url.format(pk=post_with_published_location.pk)
+    mixer.blend(
+        'blog.Comment', author=another_user,
+        post=post_with_published_location
+    )
+    client.get(url)
+    another_user.username = 'renamed'
+    another_user.save()
+    assert '@renamed' in client.get(url).content.decode(), (
+        'Убедитесь, что кеш комментариев сбрасывается при смене имени '
+        'их автора.'
+    )
@@ -0,0 +1,54 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _count_queries(client, url):
+    with CaptureQueriesContext(connection) as captured:
+        client.get(url)
+    return len(captured.captured_queries)
+
+
+@pytest.mark.parametrize(
+    'url', ['/', '/category/{category}/', '/profile/{username}/']
+)
+def test_feed_query_count_is_fixed(
+        mixer, user, user_client, published_category, published_location,
+        url):
+    url = url.format(
+        category=published_category.slug, username=user.username
+    )
+    mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location,
+    )
+    single_post_queries = _count_queries(user_client, url)
+    mixer.cycle(9).blend(
+        'blog.Post', author=mixer.blend('auth.User'),
+        category=mixer.blend('blog.Category', is_published=True),
+        location=mixer.blend('blog.Location'),
+    )
+    mixer.cycle(5).blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location,
+    )
+    assert _count_queries(user_client, url) == single_post_queries, (
+        f"Убедитесь, что число запросов к БД на странице `{url}` не зависит "
+        "от количества публикаций на ней."
+    )
+
+
+def test_profile_hides_unpublished_posts_from_other_users(
+        mixer, user, user_client, another_user_client, published_category):
+    mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=False,
+    )
+    url = f'/profile/{user.username}/'
+    assert len(user_client.get(url).context['page_obj']) == 1
+    assert len(another_user_client.get(url).context['page_obj']) == 0, (
+        "Убедитесь, что снятые с публикации посты видны в профиле "
+        "только их автору."
+    )
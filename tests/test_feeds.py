@@ -0,0 +1,78 @@
+from http import HTTPStatus
+from xml.etree import ElementTree
+
+import pytest
+from django.http import StreamingHttpResponse
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_urls(post_with_published_location):
+    post = post_with_published_location
+    return [
+        f'{prefix}feed/{feed_format}/'
+        for prefix in (
+            '/',
+            f'/category/{post.category.slug}/',
+            f'/profile/{post.author.username}/',
+        )
+        for feed_format in ('atom', 'rss')
+    ]
+
+
+def _read(response):
+    return b''.join(response.streaming_content).decode('utf-8')
+
+
+def test_feeds_stream_published_posts(
+        client, feed_urls, post_with_published_location, mixer,
+        published_category):
+    hidden = mixer.blend(
+        'blog.Post', category=published_category, is_published=False
+    )
+    for url in feed_urls:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert isinstance(response, StreamingHttpResponse), (
+            f"Убедитесь, что лента `{url}` отдаётся потоком."
+        )
+        content = _read(response)
+        ElementTree.fromstring(content)
+        assert post_with_published_location.title in content
+        assert f'/posts/{hidden.pk}/' not in content, (
+            f"Убедитесь, что в ленту `{url}` не попадают скрытые публикации."
+        )
+
+
+def test_feeds_support_conditional_get(
+        client, feed_urls, post_with_published_location):
+    etags = {url: client.get(url)['ETag'] for url in feed_urls}
+    for url, etag in etags.items():
+        cached = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert cached.status_code == HTTPStatus.NOT_MODIFIED, (
+            f"Убедитесь, что лента `{url}` поддерживает условные запросы."
+        )
+    post_with_published_location.save()
+    for url, etag in etags.items():
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.OK
+
+
+def test_unknown_feed_format(client):
+    assert client.get('/feed/json/').status_code == HTTPStatus.NOT_FOUND
+
+
+def test_hidden_category_changes_profile_feed(
+        client, post_with_published_location):
+    post = post_with_published_location
+    url = f'/profile/{post.author.username}/feed/atom/'
+    etag = client.get(url)['ETag']
+    post.category.is_published = False
+    post.category.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что лента автора обновляется при скрытии категории."
+    )
+    assert post.title not in _read(response)
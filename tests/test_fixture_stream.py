@@ -0,0 +1,101 @@
+import json
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError
+
+from blog import caching
+from blog.fixture_stream import iter_json_array
+from blog.models import Category, Post
+from blog.scheduler import next_publication_at
+
+pytestmark = [pytest.mark.django_db]
+
+FIXTURE = Path(__file__).resolve().parent.parent / 'db.json'
+
+
+def test_iter_json_array_reads_small_chunks():
+    document = '[\n{"a": "],[{"}, {"b": [1, 2]} ,\n {"c": null}\n]'
+    assert list(iter_json_array(StringIO(document), chunk_size=3)) == [
+        {'a': '],[{'}, {'b': [1, 2]}, {'c': None}
+    ]
+    with pytest.raises(ValueError):
+        list(iter_json_array(StringIO('[{"a": 1},'), chunk_size=3))
+
+
+def test_streamload_repo_fixture():
+    call_command('streamload', str(FIXTURE), batch_size=7, stdout=StringIO())
+    assert Post.objects.count() == 39
+    post = Post.objects.order_by('pk').first()
+    assert post.created_at.year == 2022, (
+        "Убедитесь, что при загрузке сохраняются даты из фикстуры."
+    )
+    assert post.excerpt and post.updated_at
+
+
+def test_streamdump_round_trip(tmp_path, post_with_published_location):
+    dump = tmp_path / 'dump.json'
+    call_command('streamdump', 'blog', indent=2, output=str(dump))
+    Category.objects.update(title='Изменено')
+    call_command('streamload', str(dump), stdout=StringIO())
+    assert Category.objects.get(
+        pk=post_with_published_location.category_id
+    ).title == post_with_published_location.category.title
+
+
+def test_streamload_bumps_coarse_tags_once(
+        monkeypatch, tmp_path, client, post_with_published_location):
+    post = post_with_published_location
+    dump = tmp_path / 'dump.json'
+    call_command('streamdump', 'blog', output=str(dump))
+    client.get(f'/posts/{post.pk}/')
+    Post.objects.filter(pk=post.pk).update(title='Изменено')
+    bumps = []
+    bump_versions = caching.bump_versions
+    monkeypatch.setattr(
+        'blog.management.commands.streamload.bump_versions',
+        lambda *names: bumps.append(names) or bump_versions(*names)
+    )
+    call_command('streamload', str(dump), stdout=StringIO())
+    assert bumps == [('posts', 'feed', caching.BULK_TAG)], (
+        "Убедитесь, что после загрузки версии тегов обновляются одной "
+        "записью, а не по тегу на каждый объект."
+    )
+    assert post.title in client.get(f'/posts/{post.pk}/').content.decode()
+
+
+def test_streamload_rolls_back_on_dangling_reference(tmp_path, user):
+    dump = tmp_path / 'dump.json'
+    dump.write_text(json.dumps([
+        {'model': 'blog.category', 'pk': 50, 'fields': {
+            'title': 'Новая', 'description': '', 'slug': 'new',
+            'is_published': True, 'created_at': '2020-01-01T00:00:00Z',
+        }},
+        {'model': 'blog.post', 'pk': 50, 'fields': {
+            'title': 'Публикация', 'text': 'Текст',
+            'pub_date': '2020-01-01T00:00:00Z', 'author': user.pk + 100,
+            'category': 50, 'created_at': '2020-01-01T00:00:00Z',
+        }},
+    ]), encoding='utf-8')
+    with pytest.raises(IntegrityError):
+        call_command('streamload', str(dump), batch_size=1, stdout=StringIO())
+    assert not Category.objects.filter(pk=50).exists(), (
+        "Убедитесь, что при ошибке ссылочной целостности загрузка "
+        "откатывается целиком."
+    )
+
+
+def test_streamload_refreshes_next_publication(
+        tmp_path, post_with_published_location):
+    post = post_with_published_location
+    dump = tmp_path / 'dump.json'
+    assert next_publication_at() is None
+    Post.objects.filter(pk=post.pk).update(pub_date='2999-01-01T00:00:00Z')
+    call_command('streamdump', 'blog', output=str(dump))
+    call_command('streamload', str(dump), stdout=StringIO())
+    assert next_publication_at() == Post.objects.get(pk=post.pk).pub_date, (
+        "Убедитесь, что после загрузки обновляется время ближайшей "
+        "публикации."
+    )
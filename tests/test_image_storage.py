@@ -0,0 +1,129 @@
+import os
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.models import Post
+from blog.renditions import manifest_name
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.BLOG_IMAGE_WORKERS = 0
+    return tmp_path
+
+
+def make_image(color='red'):
+    buffer = BytesIO()
+    Image.new('RGB', (30, 20), color).save(buffer, 'PNG')
+    return SimpleUploadedFile('photo.png', buffer.getvalue(), 'image/png')
+
+
+def test_identical_uploads_share_a_file(mixer, user, media_root):
+    first = mixer.blend('blog.Post', author=user, image=make_image())
+    second = mixer.blend('blog.Post', author=user, image=make_image())
+    assert first.image.name == second.image.name, (
+        'Убедитесь, что одинаковые изображения хранятся в одном файле.'
+    )
+    directory, first_level, second_level, name = (
+        first.image.name.split('/')
+    )
+    assert directory == 'post_images'
+    assert name.startswith(first_level + second_level)
+    assert len(list(media_root.rglob('*.png'))) == 1
+
+
+def test_collect_images_removes_unreferenced(
+        mixer, user, media_root, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        first = mixer.blend('blog.Post', author=user, image=make_image())
+        second = mixer.blend('blog.Post', author=user, image=make_image())
+    path = media_root / first.image.name
+    assert (media_root / manifest_name(first.image.name)).exists()
+    first.delete()
+    call_command('collect_images', grace=0, stdout=StringIO())
+    assert path.exists(), (
+        'Убедитесь, что файл не удаляется, пока на него ссылаются '
+        'другие публикации.'
+    )
+    second.image = make_image('blue')
+    second.save()
+    assert path.exists(), (
+        'Убедитесь, что файлы удаляются не при сохранении публикации, '
+        'а командой collect_images.'
+    )
+    call_command('collect_images', stdout=StringIO())
+    assert path.exists(), (
+        'Убедитесь, что недавно изменённые файлы не удаляются.'
+    )
+    call_command('collect_images', grace=0, stdout=StringIO())
+    assert not path.exists()
+    assert not (media_root / manifest_name(first.image.name)).exists()
+    assert (media_root / second.image.name).exists()
+
+
+def test_partial_file_is_rewritten(media_root):
+    storage = Post._meta.get_field('image').storage
+    image = make_image()
+    name = storage.hashed_name('post_images/photo.png', image)
+    (media_root / name).parent.mkdir(parents=True)
+    (media_root / name).write_bytes(b'partial')
+    assert storage.save('post_images/photo.png', image) == name
+    image.seek(0)
+    assert (media_root / name).read_bytes() == image.read(), (
+        'Убедитесь, что повреждённый файл с тем же именем перезаписывается.'
+    )
+
+
+def test_dedupe_images_command(mixer, user, media_root):
+    post = mixer.blend('blog.Post', author=user)
+    content = make_image().read()
+    for name in ('post_images/a.png', 'post_images/b.png'):
+        (media_root / 'post_images').mkdir(exist_ok=True)
+        (media_root / name).write_bytes(content)
+    Post.objects.filter(pk=post.pk).update(image='post_images/a.png')
+    other = mixer.blend('blog.Post', author=user)
+    Post.objects.filter(pk=other.pk).update(image='post_images/b.png')
+    call_command('dedupe_images', stdout=StringIO())
+    names = set(Post.objects.values_list('image', flat=True))
+    assert len(names) == 1
+    assert not (media_root / 'post_images/a.png').exists()
+    stored = Post._meta.get_field('image').storage
+    assert stored.open(names.pop()).read() == content
+
+
+@pytest.mark.parametrize('after_move', [False, True])
+def test_collect_images_keeps_file_reused_during_sweep(
+        monkeypatch, mixer, user, media_root, after_move):
+    post = mixer.blend('blog.Post', author=user, image=make_image())
+    name = post.image.name
+    post.delete()
+    path = media_root / name
+    os.utime(path, (0, 0))
+    replace = os.replace
+    reused = []
+
+    def upload_during_sweep(source, target):
+        if source == str(path) and not reused:
+            if after_move:
+                replace(source, target)
+            reused.append(
+                mixer.blend('blog.Post', author=user, image=make_image())
+            )
+            if after_move:
+                return
+        replace(source, target)
+
+    monkeypatch.setattr(os, 'replace', upload_during_sweep)
+    call_command('collect_images', grace=60, stdout=StringIO())
+    assert reused and reused[0].image.name == name
+    assert path.exists(), (
+        'Убедитесь, что collect_images не удаляет файл, который повторно '
+        'загрузили во время сборки.'
+    )
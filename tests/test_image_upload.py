@@ -0,0 +1,74 @@
+import zlib
+from io import BytesIO
+from struct import pack
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from blog.forms import BoundedImageField
+
+
+def png_header(width, height):
+    """A PNG with a huge declared size and almost no pixel data."""
+    def chunk(kind, data):
+        body = kind + data
+        return pack('>I', len(data)) + body + pack('>I', zlib.crc32(body))
+    return (
+        b'\x89PNG\r\n\x1a\n'
+        + chunk(b'IHDR', pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+        + chunk(b'IDAT', zlib.compress(b''))
+        + chunk(b'IEND', b'')
+    )
+
+
+def jpeg_with_exif():
+    buffer = BytesIO()
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    exif[0x010F] = 'Camera'
+    Image.new('RGB', (40, 20), 'blue').save(buffer, 'JPEG', exif=exif)
+    return buffer.getvalue()
+
+
+def upload(content, name='image.png'):
+    return SimpleUploadedFile(name, content)
+
+
+@pytest.mark.parametrize('size', [(20000, 20000), (8000, 8000)])
+def test_oversized_dimensions_rejected(size):
+    field = BoundedImageField()
+    with pytest.raises(ValidationError) as error:
+        field.clean(upload(png_header(*size)))
+    assert error.value.code == 'too_many_pixels', (
+        'Убедитесь, что изображения с чрезмерным числом пикселей '
+        'отклоняются до декодирования.'
+    )
+
+
+def test_large_file_rejected(settings):
+    settings.BLOG_IMAGE_MAX_BYTES = 1024
+    with pytest.raises(ValidationError) as error:
+        BoundedImageField().clean(upload(b'x' * 2048))
+    assert error.value.code == 'file_too_large'
+
+
+def test_exif_stripped_and_orientation_applied():
+    cleaned = BoundedImageField().clean(
+        upload(jpeg_with_exif(), 'photo.jpg')
+    )
+    with Image.open(cleaned) as image:
+        assert not image.getexif(), (
+            'Убедитесь, что метаданные EXIF удаляются из изображения.'
+        )
+        assert image.size == (20, 40)
+    assert cleaned.content_type == 'image/jpeg'
+    assert hasattr(cleaned, 'temporary_file_path')
+
+
+def test_plain_image_kept_as_is():
+    buffer = BytesIO()
+    Image.new('RGB', (10, 10)).save(buffer, 'PNG')
+    original = upload(buffer.getvalue())
+    assert BoundedImageField().clean(original) is original
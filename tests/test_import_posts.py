@@ -0,0 +1,170 @@
+import json
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+
+from blog.models import Category, Comment, Post
+from blog.renditions import has_renditions
+from blog.scheduler import next_publication_at
+from blog.search import find_posts
+
+pytestmark = [pytest.mark.django_db]
+
+
+def write_lines(path, records):
+    path.write_text(
+        '\n'.join(
+            record if isinstance(record, str)
+            else json.dumps(record, ensure_ascii=False)
+            for record in records
+        ),
+        encoding='utf-8'
+    )
+    return str(path)
+
+
+def gif_bytes():
+    buffer = BytesIO()
+    Image.new('RGB', (4, 4), 'red').save(buffer, 'GIF')
+    return buffer.getvalue()
+
+
+def test_import_posts_resolves_references(tmp_path, user, another_user,
+                                          published_category,
+                                          published_location):
+    records = [
+        {
+            'title': f'Импорт {number}',
+            'text': 'Снег лежит на крыше.',
+            'pub_date': '2020-01-01T10:00:00',
+            'author': user.username,
+            'category': published_category.slug,
+            'location': published_location.name,
+            'comments': [{
+                'author': another_user.username,
+                'text': 'Комментарий',
+                'created_at': '2020-01-02T10:00:00',
+            }],
+        }
+        for number in range(5)
+    ]
+    records.append('{не JSON')
+    records.append({'title': 'Без автора', 'text': 'Текст'})
+    source = write_lines(tmp_path / 'posts.jsonl', records)
+    stdout, stderr = StringIO(), StringIO()
+    with CaptureQueriesContext(connection) as queries:
+        call_command(
+            'import_posts', source, batch_size=10, stdout=stdout,
+            stderr=stderr
+        )
+    lookups = [
+        query for query in queries.captured_queries
+        if 'FROM "auth_user"' in query['sql']
+    ]
+    assert len(lookups) == 1, (
+        'Убедитесь, что авторы определяются одним запросом на пакет.'
+    )
+    assert Post.objects.count() == 5
+    assert Comment.objects.count() == 5
+    post = Post.objects.get(title='Импорт 0')
+    assert post.category == published_category
+    assert post.comment_count == 1 and post.excerpt
+    comment = post.comments.get()
+    assert comment.created_at.day == 2, (
+        'Убедитесь, что при импорте сохраняется дата комментария.'
+    )
+    assert 'Импортировано публикаций: 5' in stdout.getvalue()
+    assert 'Строка 6' in stderr.getvalue()
+    assert 'Строка 7' in stderr.getvalue()
+    found = find_posts('снега')
+    assert len(found.rows) == 5
+    assert found.categories == {published_category.pk: 5}, (
+        'Убедитесь, что импортированные публикации попадают в фасеты.'
+    )
+
+
+def test_import_posts_creates_missing(tmp_path, settings, user,
+                                      django_capture_on_commit_callbacks):
+    settings.BLOG_IMAGE_WORKERS = 0
+    settings.MEDIA_ROOT = str(tmp_path / 'media')
+    source = write_lines(tmp_path / 'posts.jsonl', [{
+        'title': 'Новое',
+        'text': 'Текст',
+        'author': 'newcomer',
+        'category': 'new-category',
+        'image': 'cover.gif',
+    }])
+    image = gif_bytes()
+    (tmp_path / 'cover.gif').write_bytes(image)
+    call_command('import_posts', source, stderr=StringIO(), stdout=StringIO())
+    assert not Post.objects.exists(), (
+        'Без --create-missing публикации с неизвестной категорией '
+        'не должны импортироваться.'
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command(
+            'import_posts', source, create_missing=True,
+            image_root=str(tmp_path), stdout=StringIO()
+        )
+    post = Post.objects.get()
+    assert post.image.name.endswith('.gif'), (
+        'Убедитесь, что изображения из импорта копируются в хранилище.'
+    )
+    assert post.image.read() == image
+    post.image.close()
+    assert has_renditions(post.image.name), (
+        'Убедитесь, что для импортированных изображений создаются '
+        'уменьшенные копии.'
+    )
+    assert post.author.username == 'newcomer'
+    assert Category.objects.filter(slug='new-category').exists()
+
+
+def test_import_posts_refreshes_next_publication(tmp_path, user,
+                                                 published_category):
+    assert next_publication_at() is None
+    source = write_lines(tmp_path / 'posts.jsonl', [{
+        'title': 'Отложенная',
+        'text': 'Текст',
+        'pub_date': '2999-01-01T10:00:00',
+        'author': user.username,
+        'category': published_category.slug,
+    }])
+    call_command('import_posts', source, stdout=StringIO())
+    assert next_publication_at() == Post.objects.get().pub_date, (
+        'Убедитесь, что после импорта отложенных публикаций обновляется '
+        'время ближайшей публикации.'
+    )
+
+
+@pytest.mark.parametrize(
+    'image', ['../secret.gif', '/etc/hostname', 'big.gif']
+)
+def test_import_posts_rejects_unsafe_images(tmp_path, settings, user,
+                                            published_category, image):
+    settings.BLOG_IMAGE_MAX_BYTES = 64
+    root = tmp_path / 'images'
+    root.mkdir()
+    (tmp_path / 'secret.gif').write_bytes(gif_bytes())
+    (root / 'big.gif').write_bytes(gif_bytes() + b'\0' * 100)
+    source = write_lines(tmp_path / 'posts.jsonl', [{
+        'title': 'Публикация',
+        'text': 'Текст',
+        'author': user.username,
+        'category': published_category.slug,
+        'image': image,
+    }])
+    stderr = StringIO()
+    call_command(
+        'import_posts', source, image_root=str(root), stderr=stderr,
+        stdout=StringIO()
+    )
+    assert not Post.objects.get().image, (
+        'Убедитесь, что импорт не читает файлы вне каталога изображений '
+        'и проверяет размер изображений.'
+    )
+    assert f'Изображение {image}' in stderr.getvalue()
@@ -0,0 +1,59 @@
+from http import HTTPStatus
+
+import pytest
+
+from conftest import N_PER_PAGE, get_response_queries
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _get_page(client, url):
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f"Убедитесь, что страница `{url}` загружается без ошибок."
+    )
+    return response.context['page_obj']
+
+
+@pytest.mark.parametrize('url', ['/', '/profile/{username}/'])
+def test_keyset_pages_cover_feed(
+        user, user_client, many_posts_with_published_locations, url):
+    url = url.format(username=user.username)
+    posts = many_posts_with_published_locations
+    first_page = _get_page(user_client, f'{url}?cursor=')
+    assert len(first_page) == N_PER_PAGE
+    assert not first_page.has_previous()
+    assert first_page.has_next()
+
+    second_page = _get_page(
+        user_client, f'{url}?cursor={first_page.next_cursor}'
+    )
+    seen = [post.id for post in first_page] + [post.id for post in second_page]
+    assert sorted(seen) == sorted(post.id for post in posts), (
+        "Убедитесь, что курсорная пагинация выдаёт каждую публикацию "
+        "ровно один раз."
+    )
+    keys = [(post.pub_date, post.id) for post in (*first_page, *second_page)]
+    assert keys == sorted(keys, reverse=True)
+    assert not second_page.has_next()
+    assert second_page.has_previous()
+
+    back_page = _get_page(
+        user_client, f'{url}?cursor={second_page.previous_cursor}'
+    )
+    assert [post.id for post in back_page] == [
+        post.id for post in first_page
+    ]
+
+
+def test_keyset_page_skips_count_query(
+        user_client, many_posts_with_published_locations):
+    _, queries = get_response_queries(user_client, '/?cursor=')
+    assert not any(
+        'COUNT(*)' in sql.upper() for sql in queries
+    ), "Убедитесь, что курсорная пагинация не выполняет COUNT-запрос."
+
+
+def test_invalid_cursor_returns_404(user_client):
+    response = user_client.get('/?cursor=not-a-cursor')
+    assert response.status_code == HTTPStatus.NOT_FOUND
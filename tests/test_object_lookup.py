@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+
+from conftest import get_response_queries
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _lookups(client, url, table):
+    response, queries = get_response_queries(client, url)
+    return response, [
+        sql for sql in queries
+        if sql.startswith('SELECT')
+        and f'FROM "{table}"' in sql
+        and f'"{table}"."id" = ' in sql
+    ]
+
+
+@pytest.mark.parametrize('url', [
+    '/posts/{pk}/', '/posts/{pk}/edit/', '/posts/{pk}/delete/'
+])
+def test_post_fetched_once(user_client, post_with_published_location, url):
+    post = post_with_published_location
+    response, lookups = _lookups(
+        user_client, url.format(pk=post.pk), 'blog_post'
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert len(lookups) == 1, (
+        f'Убедитесь, что страница `{url}` получает публикацию '
+        'одним запросом.'
+    )
+    assert 'INNER JOIN "auth_user"' in lookups[0]
+
+
+@pytest.mark.parametrize('url', [
+    '/posts/{post}/edit_comment/{pk}/', '/posts/{post}/delete_comment/{pk}/'
+])
+def test_comment_fetched_once(user_client, own_comment, url):
+    url = url.format(post=own_comment.post_id, pk=own_comment.pk)
+    response, lookups = _lookups(user_client, url, 'blog_comment')
+    assert response.status_code == HTTPStatus.OK
+    assert len(lookups) == 1
+    _, post_lookups = _lookups(user_client, url, 'blog_post')
+    assert not post_lookups, (
+        'Убедитесь, что при редактировании комментария публикация '
+        'не запрашивается отдельно.'
+    )
+
+
+def test_permissions_kept(another_user_client, unlogged_client,
+                          own_comment):
+    post = own_comment.post
+    post.is_published = False
+    post.save()
+    assert another_user_client.get(
+        f'/posts/{post.pk}/'
+    ).status_code == HTTPStatus.NOT_FOUND
+    assert unlogged_client.get(
+        f'/posts/{post.pk}/'
+    ).status_code == HTTPStatus.NOT_FOUND
+    response = another_user_client.get(f'/posts/{post.pk}/edit/')
+    assert response.status_code == HTTPStatus.FOUND
+    assert response['Location'] == f'/posts/{post.pk}/'
+    response = another_user_client.get(
+        f'/posts/{post.pk}/edit_comment/{own_comment.pk}/'
+    )
+    assert response['Location'] == f'/posts/{post.pk}/'
+    assert another_user_client.get(
+        f'/posts/{post.pk + 100}/delete/'
+    ).status_code == HTTPStatus.NOT_FOUND
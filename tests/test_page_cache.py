@@ -0,0 +1,97 @@
+import pytest
+from django.core.cache import cache
+
+from conftest import get_response_queries
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _is_cached(client, url):
+    return not get_response_queries(client, url)[1]
+
+
+@pytest.fixture
+def urls(post_with_published_location):
+    post = post_with_published_location
+    return [
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/posts/{post.id}/',
+    ]
+
+
+def test_anonymous_pages_are_cached(client, urls):
+    for url in urls:
+        first, _ = get_response_queries(client, url)
+        second, queries = get_response_queries(client, url)
+        assert not queries, (
+            f"Убедитесь, что страница `{url}` для анонимных пользователей "
+            "отдаётся из кеша."
+        )
+        assert second.content == first.content
+
+
+def test_authenticated_pages_are_not_cached(user_client, urls):
+    for url in urls:
+        user_client.get(url)
+        assert not _is_cached(user_client, url)
+
+
+def test_post_change_purges_its_pages(client, urls,
+                                      post_with_published_location):
+    for url in urls:
+        client.get(url)
+    post_with_published_location.title = 'Обновлённый заголовок'
+    post_with_published_location.save()
+    for url in urls:
+        response, queries = get_response_queries(client, url)
+        assert queries and 'Обновлённый заголовок' in (
+            response.content.decode('utf-8')
+        ), f"Убедитесь, что кеш страницы `{url}` сбрасывается."
+
+
+def test_comment_purges_post_detail(mixer, client,
+                                    post_with_published_location):
+    url = f'/posts/{post_with_published_location.id}/'
+    client.get(url)
+    comment = mixer.blend('blog.Comment', post=post_with_published_location)
+    first_line = comment.text.split('\n')[0]
+    assert first_line in client.get(url).content.decode('utf-8')
+
+
+def test_unrelated_change_keeps_page(mixer, client,
+                                     post_with_published_location):
+    url = f'/posts/{post_with_published_location.id}/'
+    client.get(url)
+    mixer.blend('blog.Category').save()
+    mixer.blend('blog.Post')
+    assert _is_cached(client, url), (
+        "Убедитесь, что изменения, не затрагивающие страницу, "
+        "не сбрасывают её кеш."
+    )
+
+
+def test_first_render_on_cold_cache_is_stored(client, urls):
+    for url in urls:
+        cache.clear()
+        client.get(url)
+        assert _is_cached(client, url), (
+            "Убедитесь, что страница сохраняется в кеш и тогда, когда "
+            "версии её тегов создаются при первом показе."
+        )
+
+
+def test_commenter_rename_purges_post_detail(mixer, client, another_user,
+                                             post_with_published_location):
+    url = f'/posts/{post_with_published_location.id}/'
+    mixer.blend(
+        'blog.Comment', author=another_user,
+        post=post_with_published_location
+    )
+    client.get(url)
+    another_user.username = 'renamed'
+    another_user.save()
+    assert '@renamed' in client.get(url).content.decode('utf-8'), (
+        "Убедитесь, что кеш страницы сбрасывается при смене имени "
+        "автора комментария."
+    )
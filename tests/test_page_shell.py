@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+
+from blog.caching import HEADER_HOLE
+from conftest import get_response_queries
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def page_shell(settings):
+    settings.BLOG_PAGE_SHELL = True
+    settings.BLOG_DEFERRED_POST_DETAIL = True
+    cache.clear()
+
+
+def _get(client, url, **headers):
+    response, queries = get_response_queries(client, url, **headers)
+    return response, [sql for sql in queries if 'FROM "blog_post"' in sql]
+
+
+@pytest.mark.parametrize('url', ['/', '/posts/{pk}/'])
+def test_shell_shared_between_users(user, another_user, user_client,
+                                    another_user_client, unlogged_client,
+                                    post_with_published_location, url):
+    url = url.format(pk=post_with_published_location.pk)
+    first, _ = _get(user_client, url)
+    second, queries = _get(another_user_client, url)
+    assert not queries, (
+        'Убедитесь, что общая часть страницы кешируется для всех '
+        'пользователей.'
+    )
+    content = second.content.decode()
+    assert f'>{another_user.username}</a>' in content
+    assert f'>{user.username}</a>' not in content
+    assert HEADER_HOLE not in content
+    anonymous, queries = _get(unlogged_client, url)
+    assert not queries and 'Войти' in anonymous.content.decode()
+    assert len({first['ETag'], second['ETag'], anonymous['ETag']}) == 3, (
+        'Убедитесь, что ETag страницы различается для разных '
+        'пользователей.'
+    )
+
+
+def test_etag_is_personal(user_client, another_user_client,
+                          post_with_published_location):
+    etag = user_client.get('/')['ETag']
+    assert user_client.get(
+        '/', HTTP_IF_NONE_MATCH=etag
+    ).status_code == HTTPStatus.NOT_MODIFIED
+    assert another_user_client.get(
+        '/', HTTP_IF_NONE_MATCH=etag
+    ).status_code == HTTPStatus.OK
+
+
+def test_hidden_post_not_shared(user_client, another_user_client,
+                                post_with_published_location):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    assert user_client.get(f'/posts/{post.pk}/').status_code == (
+        HTTPStatus.OK
+    )
+    assert another_user_client.get(
+        f'/posts/{post.pk}/'
+    ).status_code == HTTPStatus.NOT_FOUND
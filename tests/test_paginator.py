@@ -0,0 +1,45 @@
+import pytest
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+from blog.paginators import FeedPaginator
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_paginator_renders_window_only():
+    paginator = FeedPaginator(range(500000), 10)
+    page = paginator.page(25000)
+    content = render_to_string(
+        'includes/paginator.html', {'page_obj': page}
+    )
+    assert content.count('<li') <= 15, (
+        "Убедитесь, что пагинатор не выводит ссылки на все страницы."
+    )
+    for number in (1, 24999, 25000, 25001, 50000):
+        assert f'>{number}<' in content
+    assert '&hellip;' in content
+
+
+def _paginator_count(key):
+    paginator = FeedPaginator(
+        Post.objects.published_feed(), 10, count_cache_key=key
+    )
+    with CaptureQueriesContext(connection) as captured:
+        count = paginator.count
+    return count, len(captured.captured_queries)
+
+
+def test_paginator_count_is_cached(mixer, published_category):
+    mixer.blend('blog.Post', category=published_category)
+    count, queries = _paginator_count('test')
+    assert (count, queries) == (1, 1)
+    assert _paginator_count('test') == (1, 0), (
+        "Убедитесь, что число публикаций кешируется между запросами."
+    )
+    mixer.blend('blog.Post', category=published_category)
+    assert _paginator_count('test') == (2, 1), (
+        "Убедитесь, что кеш числа публикаций сбрасывается при их изменении."
+    )
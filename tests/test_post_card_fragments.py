@@ -0,0 +1,104 @@
+from http import HTTPStatus
+
+import pytest
+from bs4 import BeautifulSoup
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def _cards(response):
+    assert response.status_code == HTTPStatus.OK
+    soup = BeautifulSoup(response.content.decode(), features='html.parser')
+    more = soup.find('a', attrs={'data-posts-next': True})
+    return soup, more['href'] if more else None
+
+
+@pytest.mark.parametrize('url', [
+    '/', '/category/{slug}/', '/profile/{username}/'
+])
+def test_cards_continue_page(user, client, published_category,
+                             many_posts_with_published_locations, url):
+    url = url.format(
+        slug=published_category.slug, username=user.username
+    )
+    page = client.get(url)
+    cards_url = page.context['cards_url']
+    assert cards_url, (
+        'Убедитесь, что на странице со следующей страницей есть ссылка '
+        'на фрагмент с карточками публикаций.'
+    )
+    soup, next_url = _cards(client.get(cards_url))
+    assert not soup.find('header') and not soup.find('nav'), (
+        'Убедитесь, что фрагмент содержит только карточки публикаций.'
+    )
+    seen = [post.id for post in page.context['page_obj']] + [
+        int(link['href'].rstrip('/').rsplit('/', 1)[1])
+        for link in soup.find_all('a', href=True)
+        if link.get_text(strip=True) == 'Читать полный текст'
+    ]
+    assert sorted(seen) == sorted(
+        post.id for post in many_posts_with_published_locations
+    ), 'Убедитесь, что фрагмент продолжает ленту после страницы.'
+    assert next_url is None
+
+
+def test_cards_limit_capped(settings, client,
+                            many_posts_with_published_locations):
+    settings.BLOG_CARDS_MAX_POSTS = 3
+    response = client.get('/cards/?limit=100')
+    soup, next_url = _cards(response)
+    assert len(soup.find_all('article')) == 3
+    assert 'limit=100' in next_url
+    assert response['Link'] == f'<{next_url}>; rel="next"'
+    assert client.get('/cards/?limit=x').status_code == HTTPStatus.NOT_FOUND
+    assert client.get('/cards/?cursor=x').status_code == HTTPStatus.NOT_FOUND
+
+
+def test_cards_size_capped(settings, client,
+                           many_posts_with_published_locations):
+    settings.BLOG_CARDS_MAX_BYTES = 1
+    soup, next_url = _cards(client.get('/cards/'))
+    assert len(soup.find_all('article')) == 1, (
+        'Убедитесь, что размер фрагмента ограничен настройкой '
+        '`BLOG_CARDS_MAX_BYTES`.'
+    )
+    soup, _ = _cards(client.get(next_url))
+    assert len(soup.find_all('article')) == 1
+
+
+def test_cards_shared_and_public(user_client, another_user_client,
+                                 many_posts_with_published_locations):
+    response = user_client.get('/cards/')
+    assert 'public' in response['Cache-Control']
+    assert 'Cookie' not in response.get('Vary', '')
+    with CaptureQueriesContext(connection) as captured:
+        cached = another_user_client.get('/cards/')
+    assert not captured.captured_queries, (
+        'Убедитесь, что фрагмент кешируется для всех пользователей.'
+    )
+    assert cached.content == response.content
+    for header in ('Cache-Control', 'Link'):
+        assert cached[header] == response[header], (
+            f'Убедитесь, что заголовок {header} отдаётся и из кеша.'
+        )
+
+
+def test_hidden_profile_cards_not_shared(
+        user, user_client, unlogged_client,
+        unpublished_posts_with_published_locations):
+    hidden = unpublished_posts_with_published_locations
+    url = f'/profile/{user.username}/cards/'
+    response = user_client.get(url)
+    assert len(_cards(response)[0].find_all('article')) == len(hidden)
+    assert 'private' in response['Cache-Control']
+    assert not _cards(unlogged_client.get(url))[0].find_all('article'), (
+        'Убедитесь, что скрытые публикации автора не попадают в общий кеш.'
+    )
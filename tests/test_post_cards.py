@@ -0,0 +1,58 @@
+import pytest
+from django.core.cache import cache
+
+from blog.caching import POST_CARD_KEY
+
+pytestmark = [pytest.mark.django_db]
+
+MARKER = 'cached-post-card-marker'
+
+
+def _plant_marker(post):
+    key = POST_CARD_KEY.format(post.pk)
+    stamp, _ = cache.get(key)
+    cache.set(key, (stamp, MARKER))
+
+
+def _index(client):
+    return client.get('/').content.decode('utf-8')
+
+
+def test_post_card_fragment_is_reused(
+        user_client, post_with_published_location):
+    _index(user_client)
+    _plant_marker(post_with_published_location)
+    assert MARKER in _index(user_client), (
+        "Убедитесь, что карточка публикации берётся из кеша фрагментов."
+    )
+
+
+@pytest.mark.parametrize('change', ['post', 'category', 'location', 'author'])
+def test_post_card_fragment_is_invalidated(
+        user_client, post_with_published_location, change):
+    post = post_with_published_location
+    _index(user_client)
+    _plant_marker(post)
+    related = {
+        'post': post,
+        'category': post.category,
+        'location': post.location,
+        'author': post.author,
+    }[change]
+    related.save()
+    assert MARKER not in _index(user_client), (
+        f"Убедитесь, что кеш карточки сбрасывается при изменении: {change}."
+    )
+
+
+def test_post_card_stamp_catches_unsignalled_updates(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    _index(user_client)
+    _plant_marker(post)
+    type(post).objects.filter(pk=post.pk).update(comment_count=5)
+    content = _index(user_client)
+    assert MARKER not in content, (
+        "Убедитесь, что версия карточки зависит от числа комментариев."
+    )
+    assert 'Комментарии (5)' in content
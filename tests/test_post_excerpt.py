@@ -0,0 +1,45 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.template.defaultfilters import truncatewords
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+LONG_TEXT = ' '.join(f'слово{i}' for i in range(450))
+
+
+def test_excerpt_is_filled_on_save(post_with_published_location):
+    post = post_with_published_location
+    post.text = LONG_TEXT
+    post.save()
+    post.refresh_from_db()
+    assert post.excerpt == truncatewords(LONG_TEXT, 10), (
+        "Убедитесь, что анонс публикации обновляется при её сохранении."
+    )
+    assert post.reading_time == 3
+
+
+def test_backfill_excerpts_command(post_with_published_location):
+    Post.objects.update(excerpt='', reading_time=9)
+    call_command('backfill_excerpts', stdout=StringIO())
+    post_with_published_location.refresh_from_db()
+    assert post_with_published_location.excerpt == truncatewords(
+        post_with_published_location.text, 10
+    )
+    assert post_with_published_location.reading_time == 1
+
+
+def test_feed_does_not_load_post_text(
+        user_client, post_with_published_location):
+    with CaptureQueriesContext(connection) as captured:
+        content = user_client.get('/').content.decode('utf-8')
+    assert not any(
+        '"blog_post"."text"' in query['sql']
+        for query in captured.captured_queries
+    ), "Убедитесь, что лента не загружает полный текст публикаций."
+    assert post_with_published_location.excerpt in content
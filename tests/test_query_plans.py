@@ -0,0 +1,69 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+from blog.paginators import KeysetPaginator
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='EXPLAIN QUERY PLAN is SQLite'
+    ),
+]
+
+
+def explain(query):
+    if isinstance(query, str):
+        sql, params = query, ()
+    else:
+        sql, params = query.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return '\n'.join(row[-1] for row in cursor.fetchall())
+
+
+def assert_uses_index(query, index_name):
+    plan = explain(query)
+    assert f'INDEX {index_name}' in plan, (
+        f"Убедитесь, что запрос использует индекс `{index_name}`. "
+        f"План запроса:\n{plan}"
+    )
+    assert 'TEMP B-TREE FOR ORDER BY' not in plan, (
+        f"Убедитесь, что сортировка выполняется по индексу `{index_name}`. "
+        f"План запроса:\n{plan}"
+    )
+
+
+def test_index_feed_plan():
+    assert_uses_index(Post.objects.published_feed()[:11], 'post_feed_idx')
+
+
+def test_index_feed_next_page_plan(post_with_published_location):
+    paginator = KeysetPaginator(Post.objects.published_feed(), 10)
+    cursor = paginator.encode_cursor('f', post_with_published_location)
+    with CaptureQueriesContext(connection) as captured:
+        paginator.page(cursor)
+    assert_uses_index(captured.captured_queries[-1]['sql'], 'post_feed_idx')
+
+
+def test_category_feed_plan(published_category):
+    assert_uses_index(
+        Post.objects.for_category(published_category)[:11],
+        'post_category_feed_idx'
+    )
+
+
+@pytest.mark.parametrize('include_hidden', [False, True])
+def test_profile_feed_plan(user, include_hidden):
+    assert_uses_index(
+        Post.objects.for_author(user, include_hidden=include_hidden)[:11],
+        'post_author_feed_idx'
+    )
+
+
+def test_post_comments_plan(post_with_published_location):
+    assert_uses_index(
+        post_with_published_location.comments.select_related('author'),
+        'comment_post_created_idx'
+    )
@@ -0,0 +1,102 @@
+from io import BytesIO, StringIO
+
+import pytest
+from bs4 import BeautifulSoup
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog import renditions
+from blog.renditions import generate_renditions, get_manifest, manifest_name
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.BLOG_IMAGE_WIDTHS = (320, 640)
+    settings.BLOG_IMAGE_WORKERS = 0
+    cache.clear()
+    return tmp_path
+
+
+def make_image(width=800, height=400):
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), 'red').save(buffer, 'PNG')
+    return SimpleUploadedFile('photo.png', buffer.getvalue(), 'image/png')
+
+
+@pytest.fixture
+def post_with_image(mixer, user, published_category,
+                    django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        return mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            image=make_image()
+        )
+
+
+def test_renditions_made_after_upload(post_with_image, media_root):
+    manifest = get_manifest(post_with_image.image.name)
+    assert manifest is not None, (
+        'Убедитесь, что после загрузки изображения создаются его копии.'
+    )
+    assert (manifest['width'], manifest['height']) == (800, 400)
+    for extension in ('webp', 'jpeg'):
+        names = manifest['sources'][extension]
+        assert [width for _, width in names] == [320, 640]
+        with Image.open(media_root / names[0][0]) as image:
+            assert image.size == (320, 160)
+
+
+def test_small_image_keeps_its_width(mixer, user):
+    post = mixer.blend('blog.Post', author=user, image=make_image(200, 100))
+    manifest = generate_renditions(post.image.name)
+    assert [width for _, width in manifest['sources']['jpeg']] == [200]
+
+
+def test_card_uses_srcset(client, post_with_image):
+    content = client.get('/').content.decode()
+    image = BeautifulSoup(content, 'html.parser').find('img', srcset=True)
+    assert image and '320w' in image['srcset'] and image['width'] == '800', (
+        'Убедитесь, что в карточке публикации выводятся srcset и размеры '
+        'изображения.'
+    )
+    assert 'image/webp' in content
+
+
+def test_card_without_renditions_shows_original(client, mixer, user,
+                                                published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=make_image()
+    )
+    content = client.get(f'/posts/{post.pk}/').content.decode()
+    assert post.image.url in content
+
+
+def test_generate_renditions_command(mixer, user, media_root):
+    post = mixer.blend('blog.Post', author=user, image=make_image())
+    stdout = StringIO()
+    call_command('generate_renditions', workers=2, stdout=stdout)
+    assert (media_root / manifest_name(post.image.name)).exists()
+    assert 'Обработано изображений: 1 из 1' in stdout.getvalue()
+    call_command('generate_renditions', stdout=stdout)
+    assert 'Обработано изображений: 0 из 0' in stdout.getvalue()
+
+
+def test_missing_manifest_not_cached_long(monkeypatch, mixer, user):
+    monkeypatch.setattr(renditions, 'MISSING_MANIFEST_TIMEOUT', 0)
+    post = mixer.blend('blog.Post', author=user, image=make_image())
+    assert get_manifest(post.image.name) is None
+    default_storage.save(
+        manifest_name(post.image.name),
+        ContentFile(b'{"width": 800, "height": 400, "sources": {}}')
+    )
+    assert get_manifest(post.image.name) is not None, (
+        'Убедитесь, что отсутствие копий изображения кешируется недолго.'
+    )
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.scheduler import publish_due_posts, scheduled_timeout
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_scheduled_post_goes_live(
+        monkeypatch, mixer, client, published_category):
+    pub_date = timezone.now() + timedelta(minutes=5)
+    post = mixer.blend(
+        'blog.Post', category=published_category, is_published=True,
+        pub_date=pub_date,
+    )
+    assert post.title not in client.get('/').content.decode('utf-8')
+    assert scheduled_timeout(3600) <= 300, (
+        "Убедитесь, что кеш ленты истекает к выходу отложенной публикации."
+    )
+    later = pub_date + timedelta(seconds=1)
+    monkeypatch.setattr(timezone, 'now', lambda: later)
+    assert publish_due_posts() == [post]
+    assert post.title in client.get('/').content.decode('utf-8'), (
+        "Убедитесь, что отложенная публикация появляется в ленте "
+        "в момент выхода."
+    )
+    assert publish_due_posts() == []
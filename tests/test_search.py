@@ -0,0 +1,90 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from blog.checks import check_search_backend
+from blog.models import PostFacet
+from blog.search import SEARCH_TABLE, find_posts
+from blog.stemmer import stem
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _results(client, query, cursor=None):
+    params = {'q': query}
+    if cursor:
+        params['cursor'] = cursor
+    return client.get('/search/', params).context['page_obj']
+
+
+def test_stemmer():
+    assert stem('публикации') == stem('публикация') == 'публикац'
+    assert stem('котов') == stem('кот')
+
+
+def test_search_finds_word_forms(
+        client, mixer, published_category, post_with_published_location):
+    post = mixer.blend(
+        'blog.Post', category=published_category, is_published=True,
+        title='Заметка', text='Рассказ о красивых котах и кошках.'
+    )
+    results = _results(client, 'красивый кот')
+    assert list(results) == [post], (
+        "Убедитесь, что поиск учитывает словоформы."
+    )
+    post.is_published = False
+    post.save()
+    assert list(_results(client, 'кот')) == [], (
+        "Убедитесь, что поиск не находит скрытые публикации."
+    )
+    post.delete()
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT count(*) FROM {SEARCH_TABLE}')
+        assert cursor.fetchone()[0] == 1
+
+
+def test_search_ranks_and_paginates(client, mixer, published_category):
+    in_title = mixer.blend(
+        'blog.Post', category=published_category, is_published=True,
+        title='Кот', text='Текст без упоминаний.'
+    )
+    in_text = mixer.cycle(12).blend(
+        'blog.Post', category=published_category, is_published=True,
+        title='Заметка', text='Здесь есть кот.'
+    )
+    first = _results(client, 'кот')
+    assert first[0] == in_title, (
+        "Убедитесь, что совпадения в заголовке ранжируются выше."
+    )
+    assert len(first) == 10 and first.has_next()
+    second = _results(client, 'кот', first.next_cursor)
+    assert len(second) == 3 and not second.has_next()
+    assert {*first, *second} == {in_title, *in_text}
+
+
+def test_rebuild_search_index(post_with_published_location):
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+    PostFacet.objects.all().delete()
+    assert find_posts(post_with_published_location.title).rows == []
+    call_command('rebuild_search_index', stdout=StringIO())
+    found = find_posts(post_with_published_location.title)
+    assert [row['id'] for row in found.rows] == [
+        post_with_published_location.pk
+    ]
+    assert found.locations == {post_with_published_location.location_id: 1}
+
+
+def test_invalid_search_cursor(client):
+    assert client.get('/search/?q=кот&cursor=bad').status_code == 404
+
+
+def test_search_requires_sqlite(monkeypatch):
+    monkeypatch.setattr(connection, 'vendor', 'postgresql')
+    errors = check_search_backend(None)
+    assert [error.id for error in errors] == ['blog.E001'], (
+        "Убедитесь, что запуск на базе без FTS5 завершается понятной "
+        "ошибкой проверки."
+    )
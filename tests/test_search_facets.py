@@ -0,0 +1,85 @@
+import pytest
+
+from blog.facets import bitmap, popcount
+from blog.models import PostFacet
+from blog.search import find_posts
+from conftest import get_response_queries
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_bitmap():
+    assert popcount(bitmap([1, 5, 64, 1000]) & bitmap([5, 1000, 7])) == 2
+
+
+@pytest.fixture
+def facet_posts(mixer):
+    categories = mixer.cycle(2).blend('blog.Category', is_published=True)
+    location = mixer.blend('blog.Location', is_published=True)
+    posts = [
+        mixer.blend(
+            'blog.Post', category=category, location=location,
+            is_published=True, title='Кот', text='Про котов.'
+        )
+        for category in (categories[0], categories[0], categories[1])
+    ]
+    mixer.blend(
+        'blog.Post', category=categories[1], is_published=False,
+        title='Кот', text='Скрытый кот.'
+    )
+    return categories, location, posts
+
+
+def test_facet_counts(facet_posts):
+    categories, location, posts = facet_posts
+    found = find_posts('кот')
+    assert len(found.rows) == 3
+    assert found.categories == {categories[0].pk: 2, categories[1].pk: 1}, (
+        "Убедитесь, что число результатов по категориям считается верно."
+    )
+    assert found.locations == {location.pk: 3}
+    found = find_posts('кот', category_id=categories[1].pk)
+    assert [row['id'] for row in found.rows] == [posts[2].pk]
+    assert found.locations == {location.pk: 1}
+    posts[0].delete()
+    assert find_posts('кот').categories[categories[0].pk] == 1, (
+        "Убедитесь, что счётчики обновляются при изменении публикаций."
+    )
+
+
+def test_facets_follow_post_changes(facet_posts):
+    categories, location, posts = facet_posts
+    posts[1].category = categories[1]
+    posts[1].location = None
+    posts[1].save()
+    found = find_posts('кот')
+    assert found.categories == {categories[0].pk: 1, categories[1].pk: 2}, (
+        "Убедитесь, что фасеты публикации обновляются при её сохранении."
+    )
+    assert found.locations == {location.pk: 2}
+    location.delete()
+    assert not PostFacet.objects.filter(
+        facet=PostFacet.LOCATION, value=location.pk
+    ).exists()
+
+
+def test_search_page_filters_by_facet(client, facet_posts):
+    categories, location, posts = facet_posts
+    response = client.get(
+        '/search/', {'q': 'кот', 'category': categories[1].slug}
+    )
+    assert list(response.context['page_obj']) == [posts[2]]
+    assert response.context['facets']['categories'] == [
+        (categories[0], 2), (categories[1], 1)
+    ]
+    assert client.get(
+        '/search/', {'q': 'кот', 'location': 'abc'}
+    ).status_code == 404
+
+
+def test_search_page_matches_once(client, facet_posts):
+    _, queries = get_response_queries(client, '/search/?q=кот')
+    assert sum('MATCH' in sql for sql in queries) == 1, (
+        "Убедитесь, что результаты и счётчики фасетов берутся из одного "
+        "полнотекстового запроса."
+    )
@@ -0,0 +1,95 @@
+from http import HTTPStatus
+from io import StringIO
+from xml.etree import ElementTree
+
+import pytest
+from django.core.management import call_command
+
+from blog.sitemaps import PostSitemap, shard_path
+
+pytestmark = [pytest.mark.django_db]
+
+NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+
+
+@pytest.fixture(autouse=True)
+def sitemap_root(settings, tmp_path):
+    settings.BLOG_SITEMAP_ROOT = tmp_path
+    settings.BLOG_SITEMAP_BASE_URL = 'http://testserver'
+    return tmp_path
+
+
+def _locations(content):
+    return [
+        element.text
+        for element in ElementTree.fromstring(content).iter(f'{NS}loc')
+    ]
+
+
+def _read(response):
+    return b''.join(response.streaming_content)
+
+
+def test_sitemap_lists_public_pages(
+        client, post_with_published_location, mixer):
+    post = post_with_published_location
+    hidden = mixer.blend(
+        'blog.Post', category=post.category, is_published=False
+    )
+    shards = _locations(client.get('/sitemap.xml').content)
+    assert 'http://testserver/sitemap-posts-0.xml' in shards
+    urls = set()
+    for shard in shards:
+        urls.update(_locations(_read(client.get(shard))))
+    assert {
+        f'http://testserver/posts/{post.pk}/',
+        f'http://testserver/category/{post.category.slug}/',
+        f'http://testserver/profile/{post.author.username}/',
+    } <= urls
+    assert f'http://testserver/posts/{hidden.pk}/' not in urls, (
+        "Убедитесь, что в карту сайта не попадают скрытые публикации."
+    )
+
+
+def test_post_change_invalidates_its_shard_only(
+        client, post_with_published_location):
+    post = post_with_published_location
+    for section in ('posts', 'categories'):
+        client.get(f'/sitemap-{section}-0.xml')
+    post.save()
+    assert not shard_path('posts', 0).exists(), (
+        "Убедитесь, что изменение публикации сбрасывает её часть карты."
+    )
+    assert shard_path('categories', 0).exists()
+
+
+def test_shards_are_split_by_id():
+    sitemap = PostSitemap()
+    assert sitemap.shard_of(1) == sitemap.shard_of(50000) == 0
+    assert sitemap.shard_of(50001) == 1
+
+
+def test_unknown_shard(client):
+    assert client.get('/sitemap-posts-5.xml').status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+
+def test_sitemap_ignores_host_header(client, sitemap_root,
+                                     post_with_published_location):
+    shards = _locations(
+        client.get('/sitemap.xml', HTTP_HOST='evil.example').content
+    )
+    assert all(shard.startswith('http://testserver/') for shard in shards)
+    _read(client.get('/sitemap-posts-0.xml', HTTP_HOST='evil.example'))
+    assert [path.name for path in sitemap_root.iterdir()] == [
+        'httptestserver'
+    ], 'Убедитесь, что адрес в карте сайта не берётся из заголовка Host.'
+
+
+def test_generate_sitemaps_command(settings, post_with_published_location):
+    settings.BLOG_SITEMAP_BASE_URL = 'https://example.com/'
+    call_command('generate_sitemaps', stdout=StringIO())
+    path = shard_path('posts', 0)
+    assert f'https://example.com/posts/{post_with_published_location.pk}/' \
+        in path.read_text()